@@ -0,0 +1,165 @@
+"""Cache-aside helpers backed by Redis.
+
+Caching is active when APP_REDIS_URL is set and the optional ``redis`` package is installed
+(``uv sync --extra cache``). Otherwise, and whenever Redis is unreachable, every helper falls
+through to the wrapped database read, so the cache can never break a request.
+
+Cached values are column data only: instances returned from the cache are detached from any
+session, their relationships are not loaded, and deferred columns the reader did not undefer
+(Course.description, ...) come back as None.
+"""
+
+import json
+import os
+from functools import wraps
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional, ParamSpec, Sequence, Type, TypeVar
+
+from sqlmodel import SQLModel
+
+logger = getLogger(__name__)
+
+REDIS_URL = os.environ.get("APP_REDIS_URL")
+DEFAULT_TTL = 300  # seconds
+
+M = TypeVar("M", bound=SQLModel)
+P = ParamSpec("P")
+
+_client: Optional[Any] = None
+
+
+def get_client() -> Optional[Any]:
+    """Return the shared Redis client, or None when caching is disabled."""
+    global _client
+    if REDIS_URL is None:
+        return None
+    if _client is None:
+        try:
+            import redis
+        except ImportError:
+            logger.warning("APP_REDIS_URL is set but the redis package is not installed; caching disabled")
+            return None
+        _client = redis.Redis.from_url(REDIS_URL, socket_timeout=0.5)
+    return _client
+
+
+def _dump(value: SQLModel | Sequence[SQLModel]) -> str:
+    if isinstance(value, SQLModel):
+        return value.model_dump_json()
+    return json.dumps([item.model_dump(mode="json") for item in value])
+
+
+def _load(model: Type[M], raw: bytes) -> M:
+    # SQLModel only coerces field types for table models through model_validate(), not model_validate_json()
+    return model.model_validate(json.loads(raw))
+
+
+def cached_one(key_fn: Callable[..., str], model: Type[M], ttl: int = DEFAULT_TTL):
+    """Cache-aside for readers returning a single model instance or None. Misses are not cached."""
+
+    def decorator(fn: Callable[P, Optional[M]]) -> Callable[P, Optional[M]]:
+        @wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Optional[M]:
+            client = get_client()
+            if client is None:
+                return fn(*args, **kwargs)
+
+            key = key_fn(*args, **kwargs)
+            try:
+                raw = client.get(key)
+            except Exception as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+                return fn(*args, **kwargs)
+            if raw is not None:
+                return _load(model, raw)
+
+            value = fn(*args, **kwargs)
+            if value is not None:
+                _store(client, {key: _dump(value)}, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def cached_list(key_fn: Callable[..., str], model: Type[M], ttl: int = DEFAULT_TTL):
+    """Cache-aside for readers returning a list of model instances."""
+
+    def decorator(fn: Callable[P, List[M]]) -> Callable[P, List[M]]:
+        @wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> List[M]:
+            client = get_client()
+            if client is None:
+                return fn(*args, **kwargs)
+
+            key = key_fn(*args, **kwargs)
+            try:
+                raw = client.get(key)
+            except Exception as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+                return fn(*args, **kwargs)
+            if raw is not None:
+                return [model.model_validate(item) for item in json.loads(raw)]
+
+            values = fn(*args, **kwargs)
+            _store(client, {key: _dump(values)}, ttl)
+            return values
+
+        return wrapper
+
+    return decorator
+
+
+def get_many(keys: Sequence[str], model: Type[M]) -> List[Optional[M]]:
+    """Fetch several cached instances in one round trip; missing keys come back as None."""
+    client = get_client()
+    if client is None or not keys:
+        return [None] * len(keys)
+    try:
+        raws = client.mget(keys)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {len(keys)} keys: {e}")
+        return [None] * len(keys)
+    return [None if raw is None else _load(model, raw) for raw in raws]
+
+
+def set_many(values: Dict[str, SQLModel], ttl: int = DEFAULT_TTL) -> None:
+    """Store several instances in one pipelined round trip."""
+    client = get_client()
+    if client is None or not values:
+        return
+    _store(client, {key: _dump(value) for key, value in values.items()}, ttl)
+
+
+def _store(client: Any, payloads: Dict[str, str], ttl: int) -> None:
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, payload in payloads.items():
+            pipe.set(key, payload, ex=ttl)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache write failed for {list(payloads)}: {e}")
+
+
+def invalidate(*keys: str) -> None:
+    client = get_client()
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {e}")
+
+
+def invalidate_pattern(pattern: str) -> None:
+    """Delete every key matching a glob pattern, walking the keyspace with SCAN rather than KEYS."""
+    client = get_client()
+    if client is None:
+        return
+    try:
+        keys = list(client.scan_iter(match=pattern, count=500))
+        if keys:
+            client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {pattern}: {e}")
@@ -1,10 +1,15 @@
-from sqlmodel import SQLModel, Field, Relationship, Column, JSON
+from pydantic import ConfigDict
+from sqlalchemy import DDL, BigInteger, CheckConstraint, DateTime, SmallInteger, event, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declared_attr, deferred
+from sqlalchemy.orm.attributes import get_history
+from sqlmodel import SQLModel, Field, Relationship, Column, Index, UniqueConstraint, text
 from datetime import datetime, time
-from typing import Optional, List, Dict, Any
-from enum import Enum
+from typing import Optional, List, Dict, Any, Set
+from enum import IntEnum, StrEnum
 
 
-class DayOfWeek(str, Enum):
+class DayOfWeek(StrEnum):
     MONDAY = "MONDAY"
     TUESDAY = "TUESDAY"
     WEDNESDAY = "WEDNESDAY"
@@ -14,7 +19,7 @@ class DayOfWeek(str, Enum):
     SUNDAY = "SUNDAY"
 
 
-class CourseType(str, Enum):
+class CourseType(StrEnum):
     THEORY = "THEORY"
     LAB = "LAB"
     PRACTICAL = "PRACTICAL"
@@ -22,7 +27,7 @@ class CourseType(str, Enum):
     PROJECT = "PROJECT"
 
 
-class RoomType(str, Enum):
+class RoomType(StrEnum):
     CLASSROOM = "CLASSROOM"
     LAB = "LAB"
     AUDITORIUM = "AUDITORIUM"
@@ -30,23 +35,99 @@ class RoomType(str, Enum):
     CONFERENCE_ROOM = "CONFERENCE_ROOM"
 
 
-class TimetableStatus(str, Enum):
+class TimetableStatus(StrEnum):
     DRAFT = "DRAFT"
     PUBLISHED = "PUBLISHED"
     ARCHIVED = "ARCHIVED"
 
 
+class ResourceKind(StrEnum):
+    TEACHER = "TEACHER"
+    ROOM = "ROOM"
+    SECTION = "SECTION"
+
+
+# Integer codes of the enums the solver compares, for the numpy arrays of app.solver.
+# Members are in the same order as the string enums; day_code()/room_type_code() map one to the other.
+class DayOfWeekCode(IntEnum):
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+
+class RoomTypeCode(IntEnum):
+    CLASSROOM = 0
+    LAB = 1
+    AUDITORIUM = 2
+    SEMINAR_HALL = 3
+    CONFERENCE_ROOM = 4
+
+
+# StrEnum members hash like their values, so these maps accept members and plain strings alike
+# with one dict probe instead of an Enum(value) call per conversion.
+_DAY_CODES = {day.value: DayOfWeekCode[day.name] for day in DayOfWeek}
+_ROOM_TYPE_CODES = {room_type.value: RoomTypeCode[room_type.name] for room_type in RoomType}
+
+
+def day_code(day_of_week: DayOfWeek | str) -> DayOfWeekCode:
+    code = _DAY_CODES.get(day_of_week)
+    if code is None:
+        raise ValueError(f"{day_of_week!r} is not a valid DayOfWeek")
+    return code
+
+
+def room_type_code(room_type: RoomType | str) -> RoomTypeCode:
+    code = _ROOM_TYPE_CODES.get(room_type)
+    if code is None:
+        raise ValueError(f"{room_type!r} is not a valid RoomType")
+    return code
+
+
+# Time slots are packed into one integer domain: slot_index = day * SLOTS_PER_DAY + period.
+# 7 days x 8 periods = 56 indexes, so a whole week of occupancy fits in one BIGINT bitmask.
+SLOTS_PER_DAY = 8
+SLOTS_PER_WEEK = len(DayOfWeek) * SLOTS_PER_DAY
+
+
+def slot_index(day_of_week: DayOfWeek, period: int) -> int:
+    return day_code(day_of_week) * SLOTS_PER_DAY + period
+
+
+def _deferred(*names: str) -> Any:
+    """__mapper_args__ loading the named columns only on attribute access or with undefer().
+
+    For wide text columns that list queries and the solver never read.
+    """
+
+    def mapper_args(cls: Any) -> Dict[str, Any]:
+        return {"properties": {name: deferred(cls.__table__.c[name]) for name in names}}
+
+    return declared_attr.directive(mapper_args)
+
+
+def _timestamp_column(on_update: bool = False) -> Column:
+    """Timezone-aware timestamp filled by the database clock on insert, and on every update if requested."""
+    return Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now() if on_update else None, nullable=False
+    )
+
+
 # Persistent models (stored in database)
 class Department(SQLModel, table=True):
     __tablename__ = "departments"  # type: ignore[assignment]
+    __mapper_args__ = _deferred("description")
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100, unique=True)
     code: str = Field(max_length=10, unique=True)
     description: Optional[str] = Field(default=None, max_length=500)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     semesters: List["Semester"] = Relationship(back_populates="department")
@@ -57,17 +138,21 @@ class Department(SQLModel, table=True):
 
 class Semester(SQLModel, table=True):
     __tablename__ = "semesters"  # type: ignore[assignment]
+    __table_args__ = (
+        CheckConstraint("year BETWEEN 2020 AND 2050", name="ck_semesters_year"),
+        CheckConstraint("semester_number BETWEEN 1 AND 8", name="ck_semesters_semester_number"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=50)  # e.g., "Fall 2024", "Semester 1"
-    year: int = Field(ge=2020, le=2050)
-    semester_number: int = Field(ge=1, le=8)  # 1-8 for typical degree programs
+    year: int = Field(ge=2020, le=2050, sa_type=SmallInteger)
+    semester_number: int = Field(ge=1, le=8, sa_type=SmallInteger)  # 1-8 for typical degree programs
     start_date: datetime = Field()
     end_date: datetime = Field()
     department_id: int = Field(foreign_key="departments.id")
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     department: Department = Relationship(back_populates="semesters")
@@ -77,22 +162,58 @@ class Semester(SQLModel, table=True):
 
 class Section(SQLModel, table=True):
     __tablename__ = "sections"  # type: ignore[assignment]
+    __table_args__ = (
+        CheckConstraint("capacity BETWEEN 1 AND 200", name="ck_sections_capacity"),
+        Index("ix_section_dept_semester", "department_id", "semester_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=10)  # e.g., "A", "B", "CS-A"
-    capacity: int = Field(ge=1, le=200)
+    capacity: int = Field(ge=1, le=200, sa_type=SmallInteger)
     semester_id: int = Field(foreign_key="semesters.id")
+    # Copy of semester.department_id so department queries skip the join; filled on save, see below
+    department_id: Optional[int] = Field(default=None, foreign_key="departments.id", nullable=False)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     semester: Semester = Relationship(back_populates="sections")
     timetable_entries: List["TimetableEntry"] = Relationship(back_populates="section")
 
 
+@event.listens_for(Section, "before_insert")
+@event.listens_for(Section, "before_update")
+def _set_section_department(mapper, connection, target: Section) -> None:
+    if target.department_id is None or get_history(target, "semester_id").has_changes():
+        target.department_id = connection.scalar(
+            select(Semester.department_id).where(Semester.id == target.semester_id)  # type: ignore[arg-type]
+        )
+
+
+# Moving a semester to another department is rare and may happen outside the ORM, so a trigger
+# carries the change over to its sections.
+_SECTION_DEPARTMENT_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION sections_follow_semester_department() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE sections SET department_id = NEW.department_id WHERE semester_id = NEW.id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE TRIGGER semesters_department_to_sections AFTER UPDATE OF department_id ON semesters
+    FOR EACH ROW WHEN (OLD.department_id IS DISTINCT FROM NEW.department_id)
+    EXECUTE FUNCTION sections_follow_semester_department()
+    """,
+]
+for _statement in _SECTION_DEPARTMENT_TRIGGERS:
+    event.listen(SQLModel.metadata.tables["sections"], "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class Teacher(SQLModel, table=True):
     __tablename__ = "teachers"  # type: ignore[assignment]
+    __table_args__ = (CheckConstraint("max_hours_per_week BETWEEN 1 AND 40", name="ck_teachers_max_hours_per_week"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     employee_id: str = Field(max_length=20, unique=True)
@@ -101,87 +222,193 @@ class Teacher(SQLModel, table=True):
     email: str = Field(max_length=255, unique=True)
     phone: Optional[str] = Field(default=None, max_length=20)
     department_id: int = Field(foreign_key="departments.id")
-    specializations: List[str] = Field(default=[], sa_column=Column(JSON))
-    max_hours_per_week: int = Field(default=20, ge=1, le=40)
-    preferred_time_slots: List[int] = Field(default=[], sa_column=Column(JSON))  # time_slot IDs
-    unavailable_days: List[str] = Field(default=[], sa_column=Column(JSON))  # DayOfWeek values
+    max_hours_per_week: int = Field(default=20, ge=1, le=40, sa_type=SmallInteger)
+    # Slot bitmask of unavailable_days, kept in sync by resource_service for in-memory conflict checks
+    unavailable_mask: int = Field(default=0, sa_type=BigInteger)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     department: Department = Relationship(back_populates="teachers")
+    specializations: List["TeacherSpecialization"] = Relationship(
+        back_populates="teacher", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
+    preferred_time_slots: List["TeacherPreferredTimeSlot"] = Relationship(
+        back_populates="teacher", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
+    unavailable_days: List["TeacherUnavailableDay"] = Relationship(
+        back_populates="teacher", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
     course_assignments: List["CourseAssignment"] = Relationship(back_populates="teacher")
     timetable_entries: List["TimetableEntry"] = Relationship(back_populates="teacher")
 
 
+# Child tables of the former list columns (teacher specializations, preferred slots and unavailable
+# days, room equipment, course equipment and prerequisites). Their owner key is Optional because
+# it is filled in from the parent relationship on flush; rows are always added through the parent.
+class TeacherSpecialization(SQLModel, table=True):
+    __tablename__ = "teacher_specializations"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_teacher_spec_value", "value"),)
+
+    teacher_id: Optional[int] = Field(default=None, foreign_key="teachers.id", primary_key=True, ondelete="CASCADE")
+    value: str = Field(max_length=100, primary_key=True)
+
+    # Relationships
+    teacher: Teacher = Relationship(back_populates="specializations")
+
+
+class TeacherPreferredTimeSlot(SQLModel, table=True):
+    __tablename__ = "teacher_preferred_time_slots"  # type: ignore[assignment]
+
+    teacher_id: Optional[int] = Field(default=None, foreign_key="teachers.id", primary_key=True, ondelete="CASCADE")
+    time_slot_id: int = Field(foreign_key="time_slots.id", primary_key=True, ondelete="CASCADE")
+
+    # Relationships
+    teacher: Teacher = Relationship(back_populates="preferred_time_slots")
+
+
+class TeacherUnavailableDay(SQLModel, table=True):
+    __tablename__ = "teacher_unavailable_days"  # type: ignore[assignment]
+
+    teacher_id: Optional[int] = Field(default=None, foreign_key="teachers.id", primary_key=True, ondelete="CASCADE")
+    day_of_week: DayOfWeek = Field(primary_key=True)
+
+    # Relationships
+    teacher: Teacher = Relationship(back_populates="unavailable_days")
+
+
 class Room(SQLModel, table=True):
     __tablename__ = "rooms"  # type: ignore[assignment]
+    __table_args__ = (CheckConstraint("capacity BETWEEN 1 AND 500", name="ck_rooms_capacity"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     room_number: str = Field(max_length=20)
     building: str = Field(max_length=50)
-    floor: Optional[int] = Field(default=None)
-    capacity: int = Field(ge=1, le=500)
+    floor: Optional[int] = Field(default=None, sa_type=SmallInteger)
+    capacity: int = Field(ge=1, le=500, sa_type=SmallInteger)
     room_type: RoomType = Field()
-    equipment: List[str] = Field(default=[], sa_column=Column(JSON))  # projector, whiteboard, computers, etc.
     department_id: Optional[int] = Field(default=None, foreign_key="departments.id")
     is_available: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     department: Optional[Department] = Relationship(back_populates="rooms")
+    equipment: List["RoomEquipment"] = Relationship(
+        back_populates="room", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
     timetable_entries: List["TimetableEntry"] = Relationship(back_populates="room")
 
 
+class RoomEquipment(SQLModel, table=True):
+    __tablename__ = "room_equipment"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_room_equipment_value", "value"),)
+
+    room_id: Optional[int] = Field(default=None, foreign_key="rooms.id", primary_key=True, ondelete="CASCADE")
+    value: str = Field(max_length=100, primary_key=True)  # projector, whiteboard, computers, etc.
+
+    # Relationships
+    room: Room = Relationship(back_populates="equipment")
+
+
 class Course(SQLModel, table=True):
     __tablename__ = "courses"  # type: ignore[assignment]
+    __mapper_args__ = _deferred("description")
+    __table_args__ = (
+        CheckConstraint("credits BETWEEN 1 AND 10", name="ck_courses_credits"),
+        CheckConstraint("hours_per_week BETWEEN 1 AND 10", name="ck_courses_hours_per_week"),
+        CheckConstraint("semester_number BETWEEN 1 AND 8", name="ck_courses_semester_number"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     course_code: str = Field(max_length=20, unique=True)
     name: str = Field(max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
-    credits: int = Field(ge=1, le=10)
+    credits: int = Field(ge=1, le=10, sa_type=SmallInteger)
     course_type: CourseType = Field()
-    hours_per_week: int = Field(ge=1, le=10)
+    hours_per_week: int = Field(ge=1, le=10, sa_type=SmallInteger)
     required_room_type: Optional[RoomType] = Field(default=None)
-    required_equipment: List[str] = Field(default=[], sa_column=Column(JSON))
-    semester_number: int = Field(ge=1, le=8)  # Which semester this course belongs to
+    semester_number: int = Field(ge=1, le=8, sa_type=SmallInteger)  # Which semester this course belongs to
     department_id: int = Field(foreign_key="departments.id")
-    prerequisites: List[int] = Field(default=[], sa_column=Column(JSON))  # course IDs
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     department: Department = Relationship(back_populates="courses")
+    required_equipment: List["CourseRequiredEquipment"] = Relationship(
+        back_populates="course", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+    )
+    prerequisites: List["CoursePrerequisite"] = Relationship(
+        back_populates="course",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "foreign_keys": "[CoursePrerequisite.course_id]"},
+    )
     course_assignments: List["CourseAssignment"] = Relationship(back_populates="course")
     timetable_entries: List["TimetableEntry"] = Relationship(back_populates="course")
 
 
+class CourseRequiredEquipment(SQLModel, table=True):
+    __tablename__ = "course_required_equipment"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_course_equipment_value", "value"),)
+
+    course_id: Optional[int] = Field(default=None, foreign_key="courses.id", primary_key=True, ondelete="CASCADE")
+    value: str = Field(max_length=100, primary_key=True)
+
+    # Relationships
+    course: Course = Relationship(back_populates="required_equipment")
+
+
+class CoursePrerequisite(SQLModel, table=True):
+    __tablename__ = "course_prerequisites"  # type: ignore[assignment]
+    __table_args__ = (Index("ix_course_prerequisite_id", "prerequisite_id"),)
+
+    course_id: Optional[int] = Field(default=None, foreign_key="courses.id", primary_key=True, ondelete="CASCADE")
+    prerequisite_id: int = Field(foreign_key="courses.id", primary_key=True, ondelete="CASCADE")
+
+    # Relationships
+    course: Course = Relationship(
+        back_populates="prerequisites", sa_relationship_kwargs={"foreign_keys": "[CoursePrerequisite.course_id]"}
+    )
+
+
 class TimeSlot(SQLModel, table=True):
     __tablename__ = "time_slots"  # type: ignore[assignment]
+    # Occupancy masks have one bit per slot_index, so two active slots must never share one, and an
+    # out-of-range period would alias the next day's slot or overflow the BIGINT masks.
+    __table_args__ = (
+        CheckConstraint(f"period BETWEEN 0 AND {SLOTS_PER_DAY - 1}", name="ck_time_slots_period"),
+        CheckConstraint(f"slot_index BETWEEN 0 AND {SLOTS_PER_WEEK - 1}", name="ck_time_slots_slot_index"),
+        Index("uq_time_slots_active_slot_index", "slot_index", unique=True, postgresql_where=text("is_active")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=50)  # e.g., "Period 1", "Morning Lab"
     start_time: time = Field()
     end_time: time = Field()
     day_of_week: DayOfWeek = Field()
+    period: int = Field(ge=0, le=SLOTS_PER_DAY - 1, sa_type=SmallInteger)  # 0-based position of the slot within its day
+    slot_index: int = Field(default=0, sa_type=SmallInteger)  # derived from day_of_week and period on save
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
 
     # Relationships
     timetable_entries: List["TimetableEntry"] = Relationship(back_populates="time_slot")
 
 
+@event.listens_for(TimeSlot, "before_insert")
+@event.listens_for(TimeSlot, "before_update")
+def _set_slot_index(mapper, connection, target: TimeSlot) -> None:
+    target.slot_index = slot_index(target.day_of_week, target.period)
+
+
 class CourseAssignment(SQLModel, table=True):
     __tablename__ = "course_assignments"  # type: ignore[assignment]
 
     id: Optional[int] = Field(default=None, primary_key=True)
     teacher_id: int = Field(foreign_key="teachers.id")
     course_id: int = Field(foreign_key="courses.id")
-    assigned_at: datetime = Field(default_factory=datetime.utcnow)
+    assigned_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
     is_primary: bool = Field(default=True)  # Primary teacher for the course
     is_active: bool = Field(default=True)
 
@@ -197,19 +424,36 @@ class Timetable(SQLModel, table=True):
     name: str = Field(max_length=100)
     semester_id: int = Field(foreign_key="semesters.id")
     status: TimetableStatus = Field(default=TimetableStatus.DRAFT)
-    generation_rules: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    generated_at: Optional[datetime] = Field(default=None)
+    # Free-form solver options; JSONB is stored parsed, so reading a key does not re-parse the document
+    generation_rules: Dict[str, Any] = Field(
+        default_factory=dict, sa_column=Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    )
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
+    generated_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
     generated_by: Optional[str] = Field(default=None, max_length=100)  # User or system info
 
     # Relationships
     semester: Semester = Relationship(back_populates="timetables")
-    timetable_entries: List["TimetableEntry"] = Relationship(back_populates="timetable")
+    timetable_entries: List["TimetableEntry"] = Relationship(
+        back_populates="timetable", sa_relationship_kwargs={"lazy": "selectin"}
+    )
 
 
 class TimetableEntry(SQLModel, table=True):
     __tablename__ = "timetable_entries"  # type: ignore[assignment]
+    __mapper_args__ = _deferred("notes")
+    # A teacher, room or section can hold at most one entry per time slot of a timetable. The unique
+    # indexes behind these constraints also serve the conflict-check lookups done during generation.
+    __table_args__ = (
+        UniqueConstraint("timetable_id", "teacher_id", "time_slot_id", name="uq_tte_tt_teacher_slot"),
+        UniqueConstraint("timetable_id", "room_id", "time_slot_id", name="uq_tte_tt_room_slot"),
+        UniqueConstraint("timetable_id", "section_id", "time_slot_id", name="uq_tte_tt_section_slot"),
+        # Hot working set: entries of draft and published timetables only
+        Index("ix_tte_active", "timetable_id", "time_slot_id", postgresql_where=text("NOT is_archived")),
+        # Clustering index (partial indexes cannot be clustered on), see below
+        Index("ix_tte_timetable_slot", "timetable_id", "time_slot_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timetable_id: int = Field(foreign_key="timetables.id")
@@ -219,33 +463,163 @@ class TimetableEntry(SQLModel, table=True):
     section_id: int = Field(foreign_key="sections.id")
     time_slot_id: int = Field(foreign_key="time_slots.id")
     notes: Optional[str] = Field(default=None, max_length=500)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Mirrors timetable.status == ARCHIVED so queries can stay on the small ix_tte_active partial index
+    is_archived: bool = Field(default=False, sa_column_kwargs={"server_default": text("false")})
+    created_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_timestamp_column(on_update=True))
 
     # Relationships
     timetable: Timetable = Relationship(back_populates="timetable_entries")
-    course: Course = Relationship(back_populates="timetable_entries")
-    teacher: Teacher = Relationship(back_populates="timetable_entries")
-    room: Room = Relationship(back_populates="timetable_entries")
-    section: Section = Relationship(back_populates="timetable_entries")
-    time_slot: TimeSlot = Relationship(back_populates="timetable_entries")
+    course: Course = Relationship(back_populates="timetable_entries", sa_relationship_kwargs={"lazy": "selectin"})
+    teacher: Teacher = Relationship(back_populates="timetable_entries", sa_relationship_kwargs={"lazy": "selectin"})
+    room: Room = Relationship(back_populates="timetable_entries", sa_relationship_kwargs={"lazy": "selectin"})
+    section: Section = Relationship(back_populates="timetable_entries", sa_relationship_kwargs={"lazy": "selectin"})
+    time_slot: TimeSlot = Relationship(back_populates="timetable_entries", sa_relationship_kwargs={"lazy": "selectin"})
+
+
+class TimetableOccupancy(SQLModel, table=True):
+    """Per-timetable busy bitmask of a teacher, room or section; bit i is set when slot_index i is booked."""
+
+    __tablename__ = "timetable_occupancy"  # type: ignore[assignment]
+
+    timetable_id: int = Field(foreign_key="timetables.id", primary_key=True, ondelete="CASCADE")
+    resource_kind: ResourceKind = Field(primary_key=True)
+    resource_id: int = Field(primary_key=True)
+    mask: int = Field(default=0, sa_type=BigInteger)
+
+
+class TeacherLoad(SQLModel, table=True):
+    """Number of entries (weekly hours) of a teacher in a timetable, maintained by triggers on timetable_entries."""
+
+    __tablename__ = "teacher_loads"  # type: ignore[assignment]
+
+    timetable_id: int = Field(foreign_key="timetables.id", primary_key=True, ondelete="CASCADE")
+    teacher_id: int = Field(foreign_key="teachers.id", primary_key=True, ondelete="CASCADE")
+    hours: int = Field(default=0, sa_type=SmallInteger)
+
+
+# Statement-level triggers with transition tables: a multi-row INSERT adjusts each (timetable, teacher)
+# load once per statement instead of once per row. PostgreSQL does not allow transition tables on
+# multi-event triggers, hence one trigger per event. The functions are CREATE OR REPLACE and the
+# triggers are created with the table, so create_all stays idempotent.
+_TEACHER_LOAD_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION teacher_loads_add() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO teacher_loads (timetable_id, teacher_id, hours)
+        SELECT timetable_id, teacher_id, count(*) FROM new_entries GROUP BY timetable_id, teacher_id
+        ON CONFLICT (timetable_id, teacher_id) DO UPDATE SET hours = teacher_loads.hours + excluded.hours;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION teacher_loads_remove() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE teacher_loads SET hours = teacher_loads.hours - removed.hours
+        FROM (
+            SELECT timetable_id, teacher_id, count(*) AS hours FROM old_entries GROUP BY timetable_id, teacher_id
+        ) AS removed
+        WHERE teacher_loads.timetable_id = removed.timetable_id AND teacher_loads.teacher_id = removed.teacher_id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION teacher_loads_move() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        -- Only rows whose timetable or teacher changed; status updates such as archiving are no-ops
+        INSERT INTO teacher_loads (timetable_id, teacher_id, hours)
+        SELECT timetable_id, teacher_id, sum(delta) FROM (
+            SELECT o.timetable_id, o.teacher_id, -1 AS delta FROM old_entries o JOIN new_entries n ON n.id = o.id
+            WHERE (o.timetable_id, o.teacher_id) IS DISTINCT FROM (n.timetable_id, n.teacher_id)
+            UNION ALL
+            SELECT n.timetable_id, n.teacher_id, 1 AS delta FROM old_entries o JOIN new_entries n ON n.id = o.id
+            WHERE (o.timetable_id, o.teacher_id) IS DISTINCT FROM (n.timetable_id, n.teacher_id)
+        ) AS moved
+        GROUP BY timetable_id, teacher_id
+        ON CONFLICT (timetable_id, teacher_id) DO UPDATE SET hours = teacher_loads.hours + excluded.hours;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE TRIGGER tte_teacher_loads_insert AFTER INSERT ON timetable_entries
+    REFERENCING NEW TABLE AS new_entries FOR EACH STATEMENT EXECUTE FUNCTION teacher_loads_add()
+    """,
+    """
+    CREATE TRIGGER tte_teacher_loads_delete AFTER DELETE ON timetable_entries
+    REFERENCING OLD TABLE AS old_entries FOR EACH STATEMENT EXECUTE FUNCTION teacher_loads_remove()
+    """,
+    """
+    CREATE TRIGGER tte_teacher_loads_update AFTER UPDATE ON timetable_entries
+    REFERENCING OLD TABLE AS old_entries NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION teacher_loads_move()
+    """,
+]
+for _statement in _TEACHER_LOAD_TRIGGERS:
+    event.listen(
+        SQLModel.metadata.tables["timetable_entries"], "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+
+# is_archived follows the status of the entry's timetable whichever way the status changes
+# (set_timetable_status, TimetableUpdate, a direct UPDATE), so it is kept by a trigger on timetables.
+_ENTRY_ARCHIVE_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION timetable_entries_follow_status() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE timetable_entries SET is_archived = (NEW.status = 'ARCHIVED') WHERE timetable_id = NEW.id;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE TRIGGER timetables_status_to_entries AFTER UPDATE OF status ON timetables
+    FOR EACH ROW WHEN ((OLD.status = 'ARCHIVED') IS DISTINCT FROM (NEW.status = 'ARCHIVED'))
+    EXECUTE FUNCTION timetable_entries_follow_status()
+    """,
+]
+for _statement in _ENTRY_ARCHIVE_TRIGGERS:
+    event.listen(
+        SQLModel.metadata.tables["timetable_entries"], "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+
+# Physical order of timetable_entries: CLUSTER (see timetable_service.recluster_timetable_entries)
+# rewrites the table in (timetable_id, time_slot_id) order, so one timetable sits on a few
+# contiguous pages instead of being spread over the whole heap.
+event.listen(
+    SQLModel.metadata.tables["timetable_entries"],
+    "after_create",
+    DDL("ALTER TABLE timetable_entries CLUSTER ON ix_tte_timetable_slot").execute_if(dialect="postgresql"),
+)
 
 
 # Non-persistent schemas (for validation, forms, API requests/responses)
-class DepartmentCreate(SQLModel, table=False):
+class _CreateSchema(SQLModel, table=False):
+    """Base of the *Create schemas. Unknown keys are dropped (pydantic's default extra="ignore")."""
+
+
+class _UpdateSchema(SQLModel, table=False):
+    """Base of the *Update schemas, whose fields are all optional for partial updates."""
+
+    # SQLModel types model_config as its own SQLModelConfig, which lives in a private module
+    model_config = ConfigDict(from_attributes=True)  # type: ignore[assignment]
+
+    def changes(self, exclude: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Only the fields the caller actually set, so UPDATEs touch just the changed columns."""
+        return self.model_dump(exclude_unset=True, exclude=exclude)
+
+
+class DepartmentCreate(_CreateSchema, table=False):
     name: str = Field(max_length=100)
     code: str = Field(max_length=10)
     description: Optional[str] = Field(default=None, max_length=500)
 
 
-class DepartmentUpdate(SQLModel, table=False):
+class DepartmentUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=100)
     code: Optional[str] = Field(default=None, max_length=10)
     description: Optional[str] = Field(default=None, max_length=500)
     is_active: Optional[bool] = Field(default=None)
 
 
-class SemesterCreate(SQLModel, table=False):
+class SemesterCreate(_CreateSchema, table=False):
     name: str = Field(max_length=50)
     year: int = Field(ge=2020, le=2050)
     semester_number: int = Field(ge=1, le=8)
@@ -254,7 +628,7 @@ class SemesterCreate(SQLModel, table=False):
     department_id: int
 
 
-class SemesterUpdate(SQLModel, table=False):
+class SemesterUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=50)
     year: Optional[int] = Field(default=None, ge=2020, le=2050)
     semester_number: Optional[int] = Field(default=None, ge=1, le=8)
@@ -263,32 +637,32 @@ class SemesterUpdate(SQLModel, table=False):
     is_active: Optional[bool] = Field(default=None)
 
 
-class SectionCreate(SQLModel, table=False):
+class SectionCreate(_CreateSchema, table=False):
     name: str = Field(max_length=10)
     capacity: int = Field(ge=1, le=200)
     semester_id: int
 
 
-class SectionUpdate(SQLModel, table=False):
+class SectionUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=10)
     capacity: Optional[int] = Field(default=None, ge=1, le=200)
     is_active: Optional[bool] = Field(default=None)
 
 
-class TeacherCreate(SQLModel, table=False):
+class TeacherCreate(_CreateSchema, table=False):
     employee_id: str = Field(max_length=20)
     first_name: str = Field(max_length=50)
     last_name: str = Field(max_length=50)
     email: str = Field(max_length=255)
     phone: Optional[str] = Field(default=None, max_length=20)
     department_id: int
-    specializations: List[str] = Field(default=[])
+    specializations: List[str] = Field(default_factory=list)
     max_hours_per_week: int = Field(default=20, ge=1, le=40)
-    preferred_time_slots: List[int] = Field(default=[])
-    unavailable_days: List[str] = Field(default=[])
+    preferred_time_slots: List[int] = Field(default_factory=list)
+    unavailable_days: List[str] = Field(default_factory=list)
 
 
-class TeacherUpdate(SQLModel, table=False):
+class TeacherUpdate(_UpdateSchema, table=False):
     first_name: Optional[str] = Field(default=None, max_length=50)
     last_name: Optional[str] = Field(default=None, max_length=50)
     email: Optional[str] = Field(default=None, max_length=255)
@@ -300,17 +674,17 @@ class TeacherUpdate(SQLModel, table=False):
     is_active: Optional[bool] = Field(default=None)
 
 
-class RoomCreate(SQLModel, table=False):
+class RoomCreate(_CreateSchema, table=False):
     room_number: str = Field(max_length=20)
     building: str = Field(max_length=50)
     floor: Optional[int] = Field(default=None)
     capacity: int = Field(ge=1, le=500)
     room_type: RoomType
-    equipment: List[str] = Field(default=[])
+    equipment: List[str] = Field(default_factory=list)
     department_id: Optional[int] = Field(default=None)
 
 
-class RoomUpdate(SQLModel, table=False):
+class RoomUpdate(_UpdateSchema, table=False):
     room_number: Optional[str] = Field(default=None, max_length=20)
     building: Optional[str] = Field(default=None, max_length=50)
     floor: Optional[int] = Field(default=None)
@@ -320,7 +694,7 @@ class RoomUpdate(SQLModel, table=False):
     is_available: Optional[bool] = Field(default=None)
 
 
-class CourseCreate(SQLModel, table=False):
+class CourseCreate(_CreateSchema, table=False):
     course_code: str = Field(max_length=20)
     name: str = Field(max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
@@ -328,13 +702,13 @@ class CourseCreate(SQLModel, table=False):
     course_type: CourseType
     hours_per_week: int = Field(ge=1, le=10)
     required_room_type: Optional[RoomType] = Field(default=None)
-    required_equipment: List[str] = Field(default=[])
+    required_equipment: List[str] = Field(default_factory=list)
     semester_number: int = Field(ge=1, le=8)
     department_id: int
-    prerequisites: List[int] = Field(default=[])
+    prerequisites: List[int] = Field(default_factory=list)
 
 
-class CourseUpdate(SQLModel, table=False):
+class CourseUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
     credits: Optional[int] = Field(default=None, ge=1, le=10)
@@ -346,40 +720,42 @@ class CourseUpdate(SQLModel, table=False):
     is_active: Optional[bool] = Field(default=None)
 
 
-class TimeSlotCreate(SQLModel, table=False):
+class TimeSlotCreate(_CreateSchema, table=False):
     name: str = Field(max_length=50)
     start_time: time
     end_time: time
     day_of_week: DayOfWeek
+    period: int = Field(ge=0, le=SLOTS_PER_DAY - 1)
 
 
-class TimeSlotUpdate(SQLModel, table=False):
+class TimeSlotUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=50)
     start_time: Optional[time] = Field(default=None)
     end_time: Optional[time] = Field(default=None)
     day_of_week: Optional[DayOfWeek] = Field(default=None)
+    period: Optional[int] = Field(default=None, ge=0, le=SLOTS_PER_DAY - 1)
     is_active: Optional[bool] = Field(default=None)
 
 
-class CourseAssignmentCreate(SQLModel, table=False):
+class CourseAssignmentCreate(_CreateSchema, table=False):
     teacher_id: int
     course_id: int
     is_primary: bool = Field(default=True)
 
 
-class TimetableCreate(SQLModel, table=False):
+class TimetableCreate(_CreateSchema, table=False):
     name: str = Field(max_length=100)
     semester_id: int
-    generation_rules: Dict[str, Any] = Field(default={})
+    generation_rules: Dict[str, Any] = Field(default_factory=dict)
 
 
-class TimetableUpdate(SQLModel, table=False):
+class TimetableUpdate(_UpdateSchema, table=False):
     name: Optional[str] = Field(default=None, max_length=100)
     status: Optional[TimetableStatus] = Field(default=None)
     generation_rules: Optional[Dict[str, Any]] = Field(default=None)
 
 
-class TimetableEntryCreate(SQLModel, table=False):
+class TimetableEntryCreate(_CreateSchema, table=False):
     timetable_id: int
     course_id: int
     teacher_id: int
@@ -389,10 +765,50 @@ class TimetableEntryCreate(SQLModel, table=False):
     notes: Optional[str] = Field(default=None, max_length=500)
 
 
-class TimetableEntryUpdate(SQLModel, table=False):
+class TimetableEntryUpdate(_UpdateSchema, table=False):
     course_id: Optional[int] = Field(default=None)
     teacher_id: Optional[int] = Field(default=None)
     room_id: Optional[int] = Field(default=None)
     section_id: Optional[int] = Field(default=None)
     time_slot_id: Optional[int] = Field(default=None)
     notes: Optional[str] = Field(default=None, max_length=500)
+
+
+class TimetableGenerationResult(SQLModel, table=False):
+    timetable_id: int
+    lessons_total: int  # hours still to schedule over every course x section pair
+    entries_created: int
+    unplaced_lessons: int
+    variations_tried: int
+
+
+class TimetableEntryView(SQLModel, table=False):
+    """An entry with the display fields of its course, teacher, room, section and time slot."""
+
+    id: int
+    course_id: int
+    course_code: str
+    course_name: str
+    teacher_id: int
+    teacher_name: str
+    room_id: int
+    room_number: str
+    building: str
+    section_id: int
+    section_name: str
+    time_slot_id: int
+    day_of_week: DayOfWeek
+    period: int
+    start_time: time
+    end_time: time
+    notes: Optional[str] = None
+
+
+class TimetableView(SQLModel, table=False):
+    id: int
+    name: str
+    semester_id: int
+    status: TimetableStatus
+    generated_at: Optional[datetime] = None
+    generated_by: Optional[str] = None
+    entries: List[TimetableEntryView] = Field(default_factory=list)
@@ -0,0 +1,132 @@
+"""Bitmask occupancy of teachers, rooms and sections per timetable.
+
+Every time slot has a packed slot_index (see app.models.slot_index), so the booked slots of a
+resource fit in one integer mask and a conflict check is a single AND instead of a query over
+timetable entries.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, delete, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, func, col, or_, and_
+
+from app.models import (
+    SLOTS_PER_DAY,
+    DayOfWeek,
+    ResourceKind,
+    TimeSlot,
+    TimetableEntry,
+    TimetableOccupancy,
+    day_code,
+)
+
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+OccupancyKey = Tuple[ResourceKind, int]
+
+
+def slot_bit(slot_index: int) -> int:
+    return 1 << slot_index
+
+
+def days_mask(days: Iterable[DayOfWeek | str]) -> int:
+    """Mask covering every slot of the given days."""
+    mask = 0
+    for day in days:
+        mask |= FULL_DAY_MASK << (day_code(day) * SLOTS_PER_DAY)
+    return mask
+
+
+def is_free(busy_mask: int, candidate_mask: int) -> bool:
+    return (busy_mask & candidate_mask) == 0
+
+
+def entry_keys(teacher_id: int, room_id: int, section_id: int) -> List[OccupancyKey]:
+    return [(ResourceKind.TEACHER, teacher_id), (ResourceKind.ROOM, room_id), (ResourceKind.SECTION, section_id)]
+
+
+def load_masks(
+    session: Session, timetable_id: int, keys: Optional[List[OccupancyKey]] = None
+) -> Dict[OccupancyKey, int]:
+    """Busy masks of a timetable, either all of them or only those of the given resources."""
+    query = select(TimetableOccupancy).where(TimetableOccupancy.timetable_id == timetable_id)
+    if keys is not None:
+        if not keys:
+            return {}
+        query = query.where(
+            or_(
+                *(
+                    and_(TimetableOccupancy.resource_kind == kind, TimetableOccupancy.resource_id == resource_id)
+                    for kind, resource_id in keys
+                )
+            )
+        )
+    return {(row.resource_kind, row.resource_id): row.mask for row in session.exec(query).all()}
+
+
+def is_slot_free(
+    session: Session, timetable_id: int, teacher_id: int, room_id: int, section_id: int, slot_index: int
+) -> bool:
+    masks = load_masks(session, timetable_id, entry_keys(teacher_id, room_id, section_id))
+    return is_free(_or_all(masks.values()), slot_bit(slot_index))
+
+
+def occupy(session: Session, timetable_id: int, keys: List[OccupancyKey], slot_index: int) -> None:
+    """Set the slot bit for each resource; the caller commits."""
+    occupy_masks(session, timetable_id, {key: slot_bit(slot_index) for key in keys})
+
+
+def occupy_masks(session: Session, timetable_id: int, masks: Dict[OccupancyKey, int]) -> None:
+    """OR the given masks into the stored ones with a single upsert; the caller commits."""
+    if not masks:
+        return
+    rows = [
+        {"timetable_id": timetable_id, "resource_kind": kind, "resource_id": resource_id, "mask": mask}
+        for (kind, resource_id), mask in masks.items()
+    ]
+    statement = insert(TimetableOccupancy).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["timetable_id", "resource_kind", "resource_id"],
+        set_={"mask": TimetableOccupancy.__table__.c.mask.op("|")(statement.excluded.mask)},  # type: ignore[attr-defined]
+    )
+    session.exec(statement)  # type: ignore[call-overload]
+
+
+def release(session: Session, timetable_id: int, keys: List[OccupancyKey], slot_index: int) -> None:
+    """Clear the slot bit for each resource; the caller commits."""
+    for kind, resource_id in keys:
+        row = session.get(TimetableOccupancy, (timetable_id, kind, resource_id))
+        if row is not None:
+            row.mask &= ~slot_bit(slot_index)
+            session.add(row)
+
+
+def rebuild_occupancy(session: Session, timetable_id: int) -> None:
+    """Recompute all masks of a timetable from its entries with one aggregate per resource kind."""
+    session.exec(delete(TimetableOccupancy).where(col(TimetableOccupancy.timetable_id) == timetable_id))  # type: ignore[call-overload]
+
+    slot_mask = func.bit_or(literal(1, BigInteger).op("<<")(TimeSlot.slot_index))
+    columns = {
+        ResourceKind.TEACHER: TimetableEntry.teacher_id,
+        ResourceKind.ROOM: TimetableEntry.room_id,
+        ResourceKind.SECTION: TimetableEntry.section_id,
+    }
+    for kind, resource_column in columns.items():
+        query = (
+            select(resource_column, slot_mask)
+            .join(TimeSlot, col(TimeSlot.id) == TimetableEntry.time_slot_id)
+            .where(TimetableEntry.timetable_id == timetable_id)
+            .group_by(col(resource_column))
+        )
+        for resource_id, mask in session.exec(query).all():
+            session.add(
+                TimetableOccupancy(timetable_id=timetable_id, resource_kind=kind, resource_id=resource_id, mask=mask)
+            )
+
+
+def _or_all(masks: Iterable[int]) -> int:
+    combined = 0
+    for mask in masks:
+        combined |= mask
+    return combined
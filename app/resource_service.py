@@ -0,0 +1,368 @@
+"""Persistence for the scheduling resources plus the membership queries used by the generator.
+
+List-valued attributes (specializations, equipment, prerequisites, ...) live in child
+tables, so "who/what has X" questions are answered by indexed SQL instead of decoding
+lists in Python.
+
+Departments, rooms, time slots and courses change rarely but are read on every render and
+solver run, so their readers go through the cache-aside layer in app.cache and their writers
+invalidate the affected keys. Instances served from the cache are detached; treat them as
+read-only and re-fetch through the session before modifying.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy.orm import undefer
+from sqlmodel import Session, select, func, col
+
+from app.cache import cached_list, cached_one, get_many, invalidate, invalidate_pattern, set_many
+from app.occupancy import days_mask, rebuild_occupancy
+from app.models import (
+    Course,
+    CourseCreate,
+    CoursePrerequisite,
+    CourseRequiredEquipment,
+    CourseUpdate,
+    DayOfWeek,
+    Department,
+    DepartmentUpdate,
+    Room,
+    RoomCreate,
+    RoomEquipment,
+    RoomUpdate,
+    Section,
+    Teacher,
+    TeacherCreate,
+    TeacherPreferredTimeSlot,
+    TeacherSpecialization,
+    TeacherUnavailableDay,
+    TeacherUpdate,
+    TimeSlot,
+    TimeSlotCreate,
+    TimeSlotUpdate,
+    TimetableEntry,
+    slot_index,
+)
+
+
+def _unique(values: List[str]) -> List[str]:
+    """Strip blanks and duplicates while keeping the caller's order."""
+    return list(dict.fromkeys(value.strip() for value in values if value.strip()))
+
+
+def _room_key(room_id: int) -> str:
+    return f"room:{room_id}"
+
+
+def _courses_key_prefix(department_id: int) -> str:
+    return f"course:dept:{department_id}"
+
+
+ACTIVE_TIME_SLOTS_KEY = "timeslot:all:active"
+
+
+@cached_one(lambda session, department_id: f"dept:{department_id}", Department)
+def get_department(session: Session, department_id: int) -> Optional[Department]:
+    return session.get(Department, department_id, options=[undefer(Department.description)])  # type: ignore[arg-type]
+
+
+def update_department(session: Session, department_id: int, data: DepartmentUpdate) -> Optional[Department]:
+    department = session.get(Department, department_id)
+    if department is None:
+        return None
+
+    for field, value in data.changes().items():
+        setattr(department, field, value)
+    session.add(department)
+    session.commit()
+    session.refresh(department)
+    invalidate(f"dept:{department_id}")
+    return department
+
+
+@cached_one(lambda session, room_id: _room_key(room_id), Room)
+def get_room(session: Session, room_id: int) -> Optional[Room]:
+    return session.get(Room, room_id)
+
+
+def get_rooms(session: Session, room_ids: List[int]) -> List[Room]:
+    """Rooms in the order of the given ids, unknown ids skipped.
+
+    Cached rooms arrive in one pipelined MGET; the misses are loaded with a single SELECT and
+    written back in one pipeline, so pre-loading the solver's rooms costs two round trips at most.
+    """
+    found = {room.id: room for room in get_many([_room_key(room_id) for room_id in room_ids], Room) if room}
+    missing = [room_id for room_id in room_ids if room_id not in found]
+    if missing:
+        loaded = list(session.exec(select(Room).where(col(Room.id).in_(missing))).all())
+        set_many({_room_key(room.id): room for room in loaded if room.id is not None})
+        found.update({room.id: room for room in loaded})
+    return [found[room_id] for room_id in room_ids if room_id in found]
+
+
+@cached_list(lambda session: ACTIVE_TIME_SLOTS_KEY, TimeSlot)
+def get_active_time_slots(session: Session) -> List[TimeSlot]:
+    return list(session.exec(select(TimeSlot).where(TimeSlot.is_active).order_by(col(TimeSlot.id))).all())
+
+
+def _check_slot_index_free(session: Session, time_slot: TimeSlot) -> None:
+    """Reject a second active slot at the same day and period; occupancy masks would merge them."""
+    if not time_slot.is_active:
+        return
+    index = slot_index(time_slot.day_of_week, time_slot.period)
+    query = select(TimeSlot.id).where(TimeSlot.slot_index == index, TimeSlot.is_active)
+    if time_slot.id is not None:
+        query = query.where(TimeSlot.id != time_slot.id)
+    other_id = session.exec(query).first()
+    if other_id is not None:
+        raise ValueError(f"Time slot {other_id} already covers {time_slot.day_of_week.value} period {time_slot.period}")
+
+
+def create_time_slot(session: Session, data: TimeSlotCreate) -> TimeSlot:
+    time_slot = TimeSlot(**data.model_dump())
+    _check_slot_index_free(session, time_slot)
+    session.add(time_slot)
+    session.commit()
+    session.refresh(time_slot)
+    invalidate(ACTIVE_TIME_SLOTS_KEY)
+    return time_slot
+
+
+def update_time_slot(session: Session, time_slot_id: int, data: TimeSlotUpdate) -> Optional[TimeSlot]:
+    time_slot = session.get(TimeSlot, time_slot_id)
+    if time_slot is None:
+        return None
+
+    old_index = time_slot.slot_index
+    for field, value in data.changes().items():
+        setattr(time_slot, field, value)
+    with session.no_autoflush:
+        _check_slot_index_free(session, time_slot)
+    session.add(time_slot)
+    session.flush()
+    if time_slot.slot_index != old_index:
+        # Entries keep pointing at this slot, so every mask holding its old bit must move with it
+        timetable_ids = session.exec(
+            select(TimetableEntry.timetable_id).where(TimetableEntry.time_slot_id == time_slot_id).distinct()
+        ).all()
+        for timetable_id in timetable_ids:
+            rebuild_occupancy(session, timetable_id)
+    session.commit()
+    session.refresh(time_slot)
+    invalidate(ACTIVE_TIME_SLOTS_KEY)
+    return time_slot
+
+
+@cached_list(
+    lambda session, department_id, semester_number: f"{_courses_key_prefix(department_id)}:sem:{semester_number}",
+    Course,
+)
+def get_courses_for_semester(session: Session, department_id: int, semester_number: int) -> List[Course]:
+    query = select(Course).where(
+        Course.department_id == department_id, Course.semester_number == semester_number, Course.is_active
+    )
+    return list(session.exec(query.order_by(col(Course.course_code))).all())
+
+
+def get_sections_for_department(
+    session: Session, department_id: int, semester_id: Optional[int] = None, active_only: bool = True
+) -> List[Section]:
+    """Sections of a department, optionally of one semester, from ix_section_dept_semester without a join."""
+    query = select(Section).where(Section.department_id == department_id)
+    if semester_id is not None:
+        query = query.where(Section.semester_id == semester_id)
+    if active_only:
+        query = query.where(Section.is_active)
+    return list(session.exec(query.order_by(col(Section.id))).all())
+
+
+def _set_teacher_lists(
+    teacher: Teacher,
+    specializations: Optional[List[str]],
+    preferred_time_slots: Optional[List[int]],
+    unavailable_days: Optional[List[str]],
+) -> None:
+    if specializations is not None:
+        teacher.specializations = [TeacherSpecialization(value=value) for value in _unique(specializations)]
+    if preferred_time_slots is not None:
+        teacher.preferred_time_slots = [
+            TeacherPreferredTimeSlot(time_slot_id=slot_id) for slot_id in dict.fromkeys(preferred_time_slots)
+        ]
+    if unavailable_days is not None:
+        teacher.unavailable_days = [
+            TeacherUnavailableDay(day_of_week=DayOfWeek(day)) for day in dict.fromkeys(unavailable_days)
+        ]
+        teacher.unavailable_mask = days_mask(unavailable_days)
+
+
+def create_teacher(session: Session, data: TeacherCreate) -> Teacher:
+    teacher = Teacher(
+        employee_id=data.employee_id,
+        first_name=data.first_name,
+        last_name=data.last_name,
+        email=data.email,
+        phone=data.phone,
+        department_id=data.department_id,
+        max_hours_per_week=data.max_hours_per_week,
+    )
+    _set_teacher_lists(teacher, data.specializations, data.preferred_time_slots, data.unavailable_days)
+    session.add(teacher)
+    session.commit()
+    session.refresh(teacher)
+    return teacher
+
+
+def update_teacher(session: Session, teacher_id: int, data: TeacherUpdate) -> Optional[Teacher]:
+    teacher = session.get(Teacher, teacher_id)
+    if teacher is None:
+        return None
+
+    changes = data.changes(exclude={"specializations", "preferred_time_slots", "unavailable_days"})
+    for field, value in changes.items():
+        setattr(teacher, field, value)
+    _set_teacher_lists(teacher, data.specializations, data.preferred_time_slots, data.unavailable_days)
+
+    session.add(teacher)
+    session.commit()
+    session.refresh(teacher)
+    return teacher
+
+
+def create_room(session: Session, data: RoomCreate) -> Room:
+    room = Room(
+        room_number=data.room_number,
+        building=data.building,
+        floor=data.floor,
+        capacity=data.capacity,
+        room_type=data.room_type,
+        department_id=data.department_id,
+    )
+    room.equipment = [RoomEquipment(value=value) for value in _unique(data.equipment)]
+    session.add(room)
+    session.commit()
+    session.refresh(room)
+    return room
+
+
+def update_room(session: Session, room_id: int, data: RoomUpdate) -> Optional[Room]:
+    room = session.get(Room, room_id)
+    if room is None:
+        return None
+
+    for field, value in data.changes(exclude={"equipment"}).items():
+        setattr(room, field, value)
+    if data.equipment is not None:
+        room.equipment = [RoomEquipment(value=value) for value in _unique(data.equipment)]
+
+    session.add(room)
+    session.commit()
+    session.refresh(room)
+    invalidate(_room_key(room_id))
+    return room
+
+
+def create_course(session: Session, data: CourseCreate) -> Course:
+    course = Course(
+        course_code=data.course_code,
+        name=data.name,
+        description=data.description,
+        credits=data.credits,
+        course_type=data.course_type,
+        hours_per_week=data.hours_per_week,
+        required_room_type=data.required_room_type,
+        semester_number=data.semester_number,
+        department_id=data.department_id,
+    )
+    course.required_equipment = [CourseRequiredEquipment(value=value) for value in _unique(data.required_equipment)]
+    course.prerequisites = [
+        CoursePrerequisite(prerequisite_id=course_id) for course_id in dict.fromkeys(data.prerequisites)
+    ]
+    session.add(course)
+    session.commit()
+    session.refresh(course)
+    invalidate_pattern(f"{_courses_key_prefix(course.department_id)}:*")
+    return course
+
+
+def update_course(session: Session, course_id: int, data: CourseUpdate) -> Optional[Course]:
+    course = session.get(Course, course_id)
+    if course is None:
+        return None
+
+    for field, value in data.changes(exclude={"required_equipment", "prerequisites"}).items():
+        setattr(course, field, value)
+    if data.required_equipment is not None:
+        course.required_equipment = [CourseRequiredEquipment(value=value) for value in _unique(data.required_equipment)]
+    if data.prerequisites is not None:
+        course.prerequisites = [
+            CoursePrerequisite(prerequisite_id=prerequisite_id) for prerequisite_id in dict.fromkeys(data.prerequisites)
+        ]
+
+    session.add(course)
+    session.commit()
+    session.refresh(course)
+    invalidate_pattern(f"{_courses_key_prefix(course.department_id)}:*")
+    return course
+
+
+def teachers_with_specialization(
+    session: Session, specialization: str, department_id: Optional[int] = None
+) -> List[Teacher]:
+    """Active teachers listing the given specialization, via the value index."""
+    query = (
+        select(Teacher)
+        .join(TeacherSpecialization)
+        .where(TeacherSpecialization.value == specialization, Teacher.is_active)
+    )
+    if department_id is not None:
+        query = query.where(Teacher.department_id == department_id)
+    return list(session.exec(query).all())
+
+
+def rooms_with_equipment(session: Session, equipment: List[str]) -> List[Room]:
+    """Available rooms that have every item of the given equipment."""
+    items = _unique(equipment)
+    query = select(Room).where(Room.is_available)
+    if items:
+        matching_rooms = (
+            select(RoomEquipment.room_id)
+            .where(col(RoomEquipment.value).in_(items))
+            .group_by(col(RoomEquipment.room_id))
+            .having(func.count() == len(items))
+        )
+        query = query.where(col(Room.id).in_(matching_rooms))
+    return list(session.exec(query).all())
+
+
+def rooms_for_course(
+    session: Session, course_id: int, min_capacity: int = 1, match_room_type: bool = True
+) -> List[Room]:
+    """Available rooms that satisfy a course's room type and equipment requirements.
+
+    The equipment check is a relational division done in SQL: a room qualifies when no
+    required item of the course is missing from the room's equipment. Callers that compare
+    room type codes themselves (the solver) can skip the type filter with match_room_type=False.
+    """
+    course = session.get(Course, course_id)
+    if course is None:
+        return []
+
+    room_has_item = (
+        select(RoomEquipment.room_id)
+        .where(RoomEquipment.room_id == Room.id, RoomEquipment.value == CourseRequiredEquipment.value)
+        .correlate(Room, CourseRequiredEquipment)
+    )
+    missing_equipment = (
+        select(CourseRequiredEquipment.value)
+        .where(CourseRequiredEquipment.course_id == course_id, ~room_has_item.exists())
+        .correlate(Room)
+    )
+    query = select(Room).where(Room.is_available, Room.capacity >= min_capacity, ~missing_equipment.exists())
+    if match_room_type and course.required_room_type is not None:
+        query = query.where(Room.room_type == course.required_room_type)
+    return list(session.exec(query).all())
+
+
+def unavailable_days(session: Session, teacher_id: int) -> List[DayOfWeek]:
+    query = select(TeacherUnavailableDay.day_of_week).where(TeacherUnavailableDay.teacher_id == teacher_id)
+    return [DayOfWeek(day) for day in session.exec(query).all()]
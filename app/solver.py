@@ -0,0 +1,208 @@
+"""Integer-space kernel of the timetable constraint solver.
+
+The generator translates the ORM graph into dense numpy arrays once (teachers, rooms and
+sections become row numbers, time slots become slot indexes) and the functions here do the
+constraint propagation over those arrays. They are compiled with Numba when it is installed
+(``uv sync --extra solver``) and run as plain Python otherwise, with identical results.
+
+Busy arrays are indexed ``[resource, slot_index]`` and hold 0 for a free slot. Flag arrays
+(busy, candidate rooms) and enum codes (see app.models.RoomTypeCode) are int8, ids and counters
+int32; solve() converts its inputs to contiguous arrays of those types, so the kernels are
+compiled for one signature and the inner loops scan four times fewer bytes than with int32 flags.
+"""
+
+from logging import getLogger
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = getLogger(__name__)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    logger.info("numba is not installed; the solver kernel runs as plain Python")
+    njit = None
+    prange = range
+
+
+def jit(**options) -> Callable:
+    """``numba.njit(**options)`` when Numba is available, otherwise leave the function as is."""
+
+    def decorator(fn: Callable) -> Callable:
+        if njit is None:
+            return fn
+        return njit(**options)(fn)
+
+    return decorator
+
+
+@jit(cache=True, boundscheck=False)
+def is_feasible(teacher_busy, room_busy, section_busy, teacher, room, section, slot) -> bool:
+    return teacher_busy[teacher, slot] == 0 and room_busy[room, slot] == 0 and section_busy[section, slot] == 0
+
+
+@jit(cache=True, boundscheck=False)
+def assign(teacher_busy, room_busy, section_busy, teacher, room, section, slot) -> None:
+    teacher_busy[teacher, slot] = 1
+    room_busy[room, slot] = 1
+    section_busy[section, slot] = 1
+
+
+@jit(cache=True, boundscheck=False)
+def place_lessons(
+    lesson_teacher,
+    lesson_section,
+    lesson_rooms,
+    lesson_room_type,
+    room_type,
+    slot_order,
+    start,
+    teacher_busy,
+    room_busy,
+    section_busy,
+    teacher_load,
+    teacher_max,
+    out_slot,
+    out_room,
+) -> int:
+    """Greedy first-fit placement of lessons in the given order; returns the number placed.
+
+    Each lesson takes the first slot of ``slot_order`` (rotated by ``start``) where its teacher
+    and section are free and one of its candidate rooms (``lesson_rooms[lesson, room] != 0``) is
+    free too; a lesson with ``lesson_room_type >= 0`` only accepts rooms of that ``room_type``
+    code. Unplaced lessons get -1 in ``out_slot`` and ``out_room``. The busy arrays and
+    ``teacher_load`` are updated in place.
+    """
+    n_slots = slot_order.shape[0]
+    n_rooms = lesson_rooms.shape[1]
+    placed = 0
+    for lesson in range(lesson_teacher.shape[0]):
+        teacher = lesson_teacher[lesson]
+        section = lesson_section[lesson]
+        required_type = lesson_room_type[lesson]
+        out_slot[lesson] = -1
+        out_room[lesson] = -1
+        if teacher_load[teacher] >= teacher_max[teacher]:
+            continue
+        for k in range(n_slots):
+            slot = slot_order[(start + k) % n_slots]
+            if teacher_busy[teacher, slot] != 0 or section_busy[section, slot] != 0:
+                continue
+            for room in range(n_rooms):
+                if lesson_rooms[lesson, room] == 0 or (required_type >= 0 and room_type[room] != required_type):
+                    continue
+                if is_feasible(teacher_busy, room_busy, section_busy, teacher, room, section, slot):
+                    assign(teacher_busy, room_busy, section_busy, teacher, room, section, slot)
+                    teacher_load[teacher] += 1
+                    out_slot[lesson] = slot
+                    out_room[lesson] = room
+                    placed += 1
+                    break
+            if out_slot[lesson] >= 0:
+                break
+    return placed
+
+
+@jit(cache=True, boundscheck=False, parallel=True)
+def place_variations(
+    starts,
+    lesson_teacher,
+    lesson_section,
+    lesson_rooms,
+    lesson_room_type,
+    room_type,
+    slot_order,
+    teacher_busy,
+    room_busy,
+    section_busy,
+    teacher_load,
+    teacher_max,
+    out_slot,
+    out_room,
+    out_placed,
+) -> None:
+    """Run ``place_lessons`` once per start offset, in parallel under Numba.
+
+    Every variation works on private copies of the busy arrays and writes only its own row of
+    ``out_slot``/``out_room`` and its own element of ``out_placed``, so iterations never share
+    a write target.
+    """
+    for v in prange(starts.shape[0]):
+        out_placed[v] = place_lessons(
+            lesson_teacher,
+            lesson_section,
+            lesson_rooms,
+            lesson_room_type,
+            room_type,
+            slot_order,
+            starts[v],
+            teacher_busy.copy(),
+            room_busy.copy(),
+            section_busy.copy(),
+            teacher_load.copy(),
+            teacher_max,
+            out_slot[v],
+            out_room[v],
+        )
+
+
+def _int8(array: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(array, dtype=np.int8)
+
+
+def _int32(array: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(array, dtype=np.int32)
+
+
+def solve(
+    lesson_teacher: np.ndarray,
+    lesson_section: np.ndarray,
+    lesson_rooms: np.ndarray,
+    slot_order: np.ndarray,
+    teacher_busy: np.ndarray,
+    room_busy: np.ndarray,
+    section_busy: np.ndarray,
+    teacher_load: np.ndarray,
+    teacher_max: np.ndarray,
+    variations: int = 1,
+    lesson_room_type: Optional[np.ndarray] = None,
+    room_type: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Try ``variations`` start offsets and return (slot, room) per lesson of the best one.
+
+    The best variation is the one placing the most lessons; ties go to the lowest offset, so the
+    result is deterministic. Without ``lesson_room_type``/``room_type`` any candidate room is
+    accepted regardless of its type.
+    """
+    n_lessons = lesson_teacher.shape[0]
+    if n_lessons == 0 or slot_order.shape[0] == 0:
+        unplaced = np.full(n_lessons, -1, dtype=np.int32)
+        return unplaced, unplaced.copy()
+    if lesson_room_type is None or room_type is None:
+        lesson_room_type = np.full(n_lessons, -1, dtype=np.int8)
+        room_type = np.zeros(lesson_rooms.shape[1], dtype=np.int8)
+
+    starts = np.arange(max(1, min(variations, slot_order.shape[0])), dtype=np.int32)
+    out_slot = np.empty((starts.shape[0], n_lessons), dtype=np.int32)
+    out_room = np.empty((starts.shape[0], n_lessons), dtype=np.int32)
+    out_placed = np.zeros(starts.shape[0], dtype=np.int32)
+    place_variations(
+        starts,
+        _int32(lesson_teacher),
+        _int32(lesson_section),
+        _int8(lesson_rooms),
+        _int8(lesson_room_type),
+        _int8(room_type),
+        _int32(slot_order),
+        _int8(teacher_busy),
+        _int8(room_busy),
+        _int8(section_busy),
+        _int32(teacher_load),
+        _int32(teacher_max),
+        out_slot,
+        out_room,
+        out_placed,
+    )
+    best = int(np.argmax(out_placed))
+    return out_slot[best], out_room[best]
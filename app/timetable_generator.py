@@ -0,0 +1,235 @@
+"""Automatic timetable generation for a semester.
+
+The ORM graph is exported once into dense integer arrays (see app.solver); the solver then
+places every lesson (one hour of a course for one section) without touching the database, and
+the result is written back in one transaction. Entries already present in the timetable are
+kept and treated as fixed bookings.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlmodel import Session, select, col, desc, func, insert, update
+
+from app.models import (
+    SLOTS_PER_DAY,
+    SLOTS_PER_WEEK,
+    CourseAssignment,
+    ResourceKind,
+    Semester,
+    Teacher,
+    Timetable,
+    TimetableEntry,
+    TimetableGenerationResult,
+    TimetableStatus,
+    room_type_code,
+)
+from app.occupancy import OccupancyKey, entry_keys, load_masks, occupy_masks, slot_bit
+from app.resource_service import (
+    get_active_time_slots,
+    get_courses_for_semester,
+    get_sections_for_department,
+    rooms_for_course,
+)
+from app.solver import solve
+from app.timetable_service import get_teacher_loads
+
+DEFAULT_VARIATIONS = 4
+
+
+_SLOT_SHIFTS = np.arange(SLOTS_PER_WEEK, dtype=np.uint64)
+
+
+def _mask_to_row(mask: int) -> np.ndarray:
+    return ((np.uint64(mask) >> _SLOT_SHIFTS) & np.uint64(1)).astype(np.int8)
+
+
+def generate_timetable(session: Session, timetable_id: int, generated_by: str = "system") -> TimetableGenerationResult:
+    # Only the columns needed here: loading the Timetable entity would selectin-load all its entries
+    timetable = session.exec(
+        select(Timetable.status, Timetable.semester_id, Timetable.generation_rules).where(Timetable.id == timetable_id)
+    ).first()
+    if timetable is None:
+        raise ValueError(f"Timetable {timetable_id} not found")
+    status, semester_id, generation_rules = timetable
+    if status != TimetableStatus.DRAFT:
+        raise ValueError(f"Only draft timetables can be generated, timetable {timetable_id} is {status}")
+    semester = session.get(Semester, semester_id)
+    if semester is None:
+        raise ValueError(f"Semester {semester_id} not found")
+
+    courses = get_courses_for_semester(session, semester.department_id, semester.semester_number)
+    sections = get_sections_for_department(session, semester.department_id, semester.id)
+
+    # Primary active teacher of each course, falling back to the oldest active assignment
+    course_teacher: Dict[int, int] = {}
+    course_ids = [course.id for course in courses if course.id is not None]
+    assignments = session.exec(
+        select(CourseAssignment)
+        .join(Teacher, col(Teacher.id) == CourseAssignment.teacher_id)
+        .where(col(CourseAssignment.course_id).in_(course_ids), CourseAssignment.is_active, Teacher.is_active)
+        .order_by(desc(CourseAssignment.is_primary), col(CourseAssignment.id))
+    ).all()
+    for assignment in assignments:
+        course_teacher.setdefault(assignment.course_id, assignment.teacher_id)
+
+    teachers = {
+        teacher.id: teacher
+        for teacher in session.exec(
+            select(Teacher).where(col(Teacher.id).in_(set(course_teacher.values())), Teacher.is_active)
+        ).all()
+        if teacher.id is not None
+    }
+    teacher_ids = sorted(teachers)
+    course_rooms = {
+        course.id: [
+            room
+            for room in rooms_for_course(session, course.id, match_room_type=False)
+            if room.department_id is None or room.department_id == semester.department_id
+        ]
+        for course in courses
+        if course.id is not None
+    }
+
+    # Dense numbering of the resources used by the solver
+    teacher_index = {teacher_id: i for i, teacher_id in enumerate(teacher_ids)}
+    section_index = {section.id: i for i, section in enumerate(sections) if section.id is not None}
+    room_ids = sorted({room.id for rooms in course_rooms.values() for room in rooms if room.id is not None})
+    room_index = {room_id: i for i, room_id in enumerate(room_ids)}
+    rooms_by_id = {room.id: room for rooms in course_rooms.values() for room in rooms}
+    room_capacity = {room_id: room.capacity for room_id, room in rooms_by_id.items()}
+
+    # Hours already booked per (course, section) count towards hours_per_week. A draft timetable has
+    # no archived entries; the NOT is_archived predicate is there so the planner can use ix_tte_active.
+    booked_hours: Dict[Tuple[int, int], int] = {
+        (course_id, section_id): hours
+        for course_id, section_id, hours in session.exec(
+            select(TimetableEntry.course_id, TimetableEntry.section_id, func.count())
+            .where(TimetableEntry.timetable_id == timetable_id, ~col(TimetableEntry.is_archived))
+            .group_by(col(TimetableEntry.course_id), col(TimetableEntry.section_id))
+        ).all()
+    }
+
+    # Room types as int8 codes; the solver matches them against each lesson's required code
+    room_types = np.array([room_type_code(rooms_by_id[room_id].room_type) for room_id in room_ids], dtype=np.int8)
+
+    lessons: List[Tuple[int, int, int]] = []  # (course_id, teacher_id, section_id)
+    lesson_candidates: List[List[int]] = []
+    lesson_types: List[int] = []  # required room type code, -1 for any
+    lessons_total = 0
+    for course in courses:
+        for section in sections:
+            if course.id is None or section.id is None:
+                continue
+            missing_hours = max(0, course.hours_per_week - booked_hours.get((course.id, section.id), 0))
+            lessons_total += missing_hours
+            teacher_id = course_teacher.get(course.id)
+            if teacher_id is None or teacher_id not in teachers:
+                continue
+            candidates = [
+                room_index[room.id]
+                for room in course_rooms[course.id]
+                if room.id is not None and room_capacity[room.id] >= section.capacity
+            ]
+            required_type = -1 if course.required_room_type is None else room_type_code(course.required_room_type)
+            for _ in range(missing_hours):
+                lessons.append((course.id, teacher_id, section.id))
+                lesson_candidates.append(candidates)
+                lesson_types.append(required_type)
+
+    # Most constrained lessons first: fewest candidate rooms of the required type
+    def usable_rooms(i: int) -> int:
+        if lesson_types[i] < 0:
+            return len(lesson_candidates[i])
+        return int(np.count_nonzero(room_types[lesson_candidates[i]] == lesson_types[i]))
+
+    order = sorted(range(len(lessons)), key=usable_rooms)
+    lessons = [lessons[i] for i in order]
+    lesson_candidates = [lesson_candidates[i] for i in order]
+    lesson_room_type = np.array([lesson_types[i] for i in order], dtype=np.int8)
+
+    lesson_teacher = np.array([teacher_index[t] for _, t, _ in lessons], dtype=np.int32)
+    lesson_section = np.array([section_index[s] for _, _, s in lessons], dtype=np.int32)
+    lesson_rooms = np.zeros((len(lessons), len(room_ids)), dtype=np.int8)
+    for i, candidates in enumerate(lesson_candidates):
+        lesson_rooms[i, candidates] = 1
+
+    # Active slots ordered period-major so consecutive lessons of a course spread across days
+    slots = get_active_time_slots(session)
+    slot_ids = {slot.slot_index: slot.id for slot in slots if slot.id is not None}
+    slot_order = np.array(
+        sorted(slot_ids, key=lambda index: (index % SLOTS_PER_DAY, index // SLOTS_PER_DAY)), dtype=np.int32
+    )
+
+    # Existing bookings and teacher availability
+    masks = load_masks(session, timetable_id)
+    loads = get_teacher_loads(session, timetable_id, teacher_ids)
+    teacher_busy = np.zeros((len(teacher_ids), SLOTS_PER_WEEK), dtype=np.int8)
+    teacher_load = np.zeros(len(teacher_ids), dtype=np.int32)
+    teacher_max = np.zeros(len(teacher_ids), dtype=np.int32)
+    for teacher_id, i in teacher_index.items():
+        booked = masks.get((ResourceKind.TEACHER, teacher_id), 0)
+        teacher_busy[i] = _mask_to_row(booked | teachers[teacher_id].unavailable_mask)
+        teacher_load[i] = loads.get(teacher_id, 0)
+        teacher_max[i] = teachers[teacher_id].max_hours_per_week
+    room_busy = np.zeros((len(room_ids), SLOTS_PER_WEEK), dtype=np.int8)
+    for room_id, i in room_index.items():
+        room_busy[i] = _mask_to_row(masks.get((ResourceKind.ROOM, room_id), 0))
+    section_busy = np.zeros((len(sections), SLOTS_PER_WEEK), dtype=np.int8)
+    for section_id, i in section_index.items():
+        section_busy[i] = _mask_to_row(masks.get((ResourceKind.SECTION, section_id), 0))
+
+    variations = int(generation_rules.get("variations", DEFAULT_VARIATIONS))
+    out_slot, out_room = solve(
+        lesson_teacher,
+        lesson_section,
+        lesson_rooms,
+        slot_order,
+        teacher_busy,
+        room_busy,
+        section_busy,
+        teacher_load,
+        teacher_max,
+        variations,
+        lesson_room_type=lesson_room_type,
+        room_type=room_types,
+    )
+
+    # One multi-row INSERT for all placed lessons instead of a unit-of-work flush per entry;
+    # timestamps are filled by the database.
+    rows: List[Dict[str, int]] = []
+    new_bookings: Dict[OccupancyKey, int] = {}
+    for i, (course_id, teacher_id, section_id) in enumerate(lessons):
+        slot = int(out_slot[i])
+        if slot < 0:
+            continue
+        room_id = room_ids[out_room[i]]
+        rows.append(
+            {
+                "timetable_id": timetable_id,
+                "course_id": course_id,
+                "teacher_id": teacher_id,
+                "room_id": room_id,
+                "section_id": section_id,
+                "time_slot_id": slot_ids[slot],
+            }
+        )
+        for key in entry_keys(teacher_id, room_id, section_id):
+            new_bookings[key] = new_bookings.get(key, 0) | slot_bit(slot)
+    if rows:
+        session.exec(insert(TimetableEntry), params=rows)  # type: ignore[call-overload]
+        occupy_masks(session, timetable_id, new_bookings)
+    session.execute(
+        update(Timetable)
+        .where(col(Timetable.id) == timetable_id)
+        .values(generated_at=func.now(), generated_by=generated_by)
+    )
+    session.commit()
+
+    return TimetableGenerationResult(
+        timetable_id=timetable_id,
+        lessons_total=lessons_total,
+        entries_created=len(rows),
+        unplaced_lessons=lessons_total - len(rows),
+        variations_tried=max(1, min(variations, len(slot_order))),
+    )
@@ -0,0 +1,171 @@
+"""Timetable entry persistence, conflict detection and the read model of a whole timetable."""
+
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import literal_column, select as sa_select, text
+from sqlalchemy.orm import lazyload
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlmodel import Session, col, func, select
+
+from app.models import (
+    Course,
+    Room,
+    Section,
+    Teacher,
+    TeacherLoad,
+    TimeSlot,
+    Timetable,
+    TimetableEntry,
+    TimetableEntryCreate,
+    TimetableStatus,
+    TimetableView,
+)
+from app.occupancy import entry_keys, is_slot_free, occupy, release, slot_bit
+
+
+def get_teacher_loads(
+    session: Session, timetable_id: int, teacher_ids: Optional[Iterable[int]] = None
+) -> Dict[int, int]:
+    """Booked hours per teacher in a timetable, read from the trigger-maintained teacher_loads table.
+
+    Teachers without entries are missing from the result.
+    """
+    query = select(TeacherLoad.teacher_id, TeacherLoad.hours).where(TeacherLoad.timetable_id == timetable_id)
+    if teacher_ids is not None:
+        query = query.where(col(TeacherLoad.teacher_id).in_(list(teacher_ids)))
+    return {teacher_id: hours for teacher_id, hours in session.exec(query).all()}
+
+
+def create_timetable_entry(session: Session, data: TimetableEntryCreate) -> TimetableEntry:
+    """Book a slot after checking the teacher's availability and the occupancy masks."""
+    status = session.exec(select(Timetable.status).where(Timetable.id == data.timetable_id)).first()
+    if status is None:
+        raise ValueError(f"Timetable {data.timetable_id} not found")
+    if status == TimetableStatus.ARCHIVED:
+        raise ValueError(f"Timetable {data.timetable_id} is archived")
+    time_slot = session.get(TimeSlot, data.time_slot_id)
+    if time_slot is None:
+        raise ValueError(f"Time slot {data.time_slot_id} not found")
+    teacher = session.get(Teacher, data.teacher_id)
+    if teacher is None:
+        raise ValueError(f"Teacher {data.teacher_id} not found")
+
+    if teacher.unavailable_mask & slot_bit(time_slot.slot_index):
+        raise ValueError(f"Teacher {data.teacher_id} is unavailable on {time_slot.day_of_week.value}")
+    load = session.get(TeacherLoad, (data.timetable_id, data.teacher_id))
+    if load is not None and load.hours >= teacher.max_hours_per_week:
+        raise ValueError(f"Teacher {data.teacher_id} already teaches {load.hours} hours in this timetable")
+    if not is_slot_free(
+        session, data.timetable_id, data.teacher_id, data.room_id, data.section_id, time_slot.slot_index
+    ):
+        raise ValueError(f"Time slot {data.time_slot_id} is already booked for this teacher, room or section")
+
+    entry = TimetableEntry(**data.model_dump())
+    session.add(entry)
+    occupy(session, data.timetable_id, entry_keys(data.teacher_id, data.room_id, data.section_id), time_slot.slot_index)
+    session.commit()
+    session.refresh(entry)
+    return entry
+
+
+def delete_timetable_entry(session: Session, entry_id: int) -> bool:
+    entry = session.get(TimetableEntry, entry_id)
+    if entry is None:
+        return False
+
+    time_slot = session.get(TimeSlot, entry.time_slot_id)
+    if time_slot is not None:
+        release(
+            session,
+            entry.timetable_id,
+            entry_keys(entry.teacher_id, entry.room_id, entry.section_id),
+            time_slot.slot_index,
+        )
+    session.delete(entry)
+    session.commit()
+    return True
+
+
+def recluster_timetable_entries(session: Session) -> None:
+    """Rewrite timetable_entries in (timetable_id, time_slot_id) order and refresh its statistics.
+
+    CLUSTER takes an ACCESS EXCLUSIVE lock for the duration of the rewrite, so run it from a
+    maintenance window (nightly job) rather than a request; where the pg_repack extension is
+    installed, ``pg_repack --table=timetable_entries`` does the same online.
+    """
+    session.execute(text("CLUSTER timetable_entries"))
+    session.execute(text("ANALYZE timetable_entries"))
+    session.commit()
+
+
+def set_timetable_status(session: Session, timetable_id: int, status: TimetableStatus) -> Optional[Timetable]:
+    """Change a timetable's status; the timetables trigger moves its entries in or out of the active set."""
+    # The entries are updated by the database, so skip their selectin load
+    timetable = session.get(Timetable, timetable_id, options=[lazyload(Timetable.timetable_entries)])  # type: ignore[arg-type]
+    if timetable is None:
+        return None
+
+    timetable.status = status
+    session.add(timetable)
+    session.commit()
+    return timetable
+
+
+def get_timetable_view(session: Session, timetable_id: int) -> Optional[TimetableView]:
+    """A timetable with all its entries and their display fields, fetched in one query.
+
+    PostgreSQL assembles the entries into a JSON array (json_agg of json_build_object), so the
+    result is one row holding the whole nested payload. Loading the ORM graph instead would take
+    one selectin query per relationship and send the related rows separately.
+    """
+    entry = func.json_build_object(
+        "id", TimetableEntry.id,
+        "course_id", TimetableEntry.course_id,
+        "course_code", Course.course_code,
+        "course_name", Course.name,
+        "teacher_id", TimetableEntry.teacher_id,
+        "teacher_name", func.concat_ws(" ", Teacher.first_name, Teacher.last_name),
+        "room_id", TimetableEntry.room_id,
+        "room_number", Room.room_number,
+        "building", Room.building,
+        "section_id", TimetableEntry.section_id,
+        "section_name", Section.name,
+        "time_slot_id", TimetableEntry.time_slot_id,
+        "day_of_week", TimeSlot.day_of_week,
+        "period", TimeSlot.period,
+        "start_time", TimeSlot.start_time,
+        "end_time", TimeSlot.end_time,
+        "notes", TimetableEntry.notes,
+    )  # fmt: skip
+    entries = (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(entry, col(TimeSlot.slot_index), col(Section.name))),
+                literal_column("'[]'::json"),
+            )
+        )
+        .select_from(TimetableEntry)
+        .join(Course, col(Course.id) == TimetableEntry.course_id)
+        .join(Teacher, col(Teacher.id) == TimetableEntry.teacher_id)
+        .join(Room, col(Room.id) == TimetableEntry.room_id)
+        .join(Section, col(Section.id) == TimetableEntry.section_id)
+        .join(TimeSlot, col(TimeSlot.id) == TimetableEntry.time_slot_id)
+        .where(TimetableEntry.timetable_id == Timetable.id)
+        .correlate(Timetable)
+        .scalar_subquery()
+    )
+    # Plain columns rather than the Timetable entity, which would selectin-load its entries again;
+    # sqlalchemy's select because sqlmodel's is only typed for up to four columns
+    query = sa_select(
+        col(Timetable.id),
+        col(Timetable.name),
+        col(Timetable.semester_id),
+        col(Timetable.status),
+        col(Timetable.generated_at),
+        col(Timetable.generated_by),
+        entries.label("entries"),
+    ).where(col(Timetable.id) == timetable_id)
+    row = session.execute(query).first()
+    if row is None:
+        return None
+    return TimetableView.model_validate(dict(row._mapping))
@@ -0,0 +1,104 @@
+import json
+from datetime import time
+from typing import List, Optional
+
+import pytest
+from sqlmodel import Session, select
+
+from app import cache
+from app.cache import _dump, _load, cached_list, cached_one, get_many, invalidate, invalidate_pattern, set_many
+from app.database import ENGINE, reset_db
+from app.models import Course, CourseType, DayOfWeek, Department, RoomType, TimeSlot
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def stored(new_db) -> None:
+    with Session(ENGINE) as session:
+        department = Department(name="Biology", code="BIO", description="Life sciences")
+        session.add(department)
+        session.flush()
+        assert department.id is not None
+        session.add(
+            Course(
+                course_code="BIO101",
+                name="Cells",
+                description="A long description",
+                credits=3,
+                course_type=CourseType.LAB,
+                hours_per_week=4,
+                required_room_type=RoomType.LAB,
+                semester_number=1,
+                department_id=department.id,
+            )
+        )
+        session.add(
+            TimeSlot(name="Period 3", start_time=time(10), end_time=time(11), day_of_week=DayOfWeek.FRIDAY, period=3)
+        )
+        session.commit()
+
+
+def test_round_trip_keeps_enums_times_and_aware_timestamps(stored):
+    with Session(ENGINE) as session:
+        slot = session.exec(select(TimeSlot)).one()
+        restored = _load(TimeSlot, _dump(slot).encode())
+        assert restored == slot
+        assert restored.day_of_week is DayOfWeek.FRIDAY
+        assert restored.start_time == time(10)
+        assert restored.created_at is not None and restored.created_at.tzinfo is not None
+
+        course = session.exec(select(Course)).one()
+        restored_course = _load(Course, _dump(course).encode())
+        assert restored_course.course_type is CourseType.LAB
+        assert restored_course.required_room_type is RoomType.LAB
+        assert restored_course.updated_at == course.updated_at
+
+
+def test_round_trip_of_lists(stored):
+    with Session(ENGINE) as session:
+        slots = list(session.exec(select(TimeSlot)).all())
+        raw = _dump(slots)
+        assert [TimeSlot.model_validate(item) for item in json.loads(raw)] == slots
+
+
+def test_unloaded_deferred_columns_are_left_out(stored):
+    with Session(ENGINE) as session:
+        course = session.exec(select(Course)).one()
+        assert "description" not in json.loads(_dump(course))
+        assert _load(Course, _dump(course).encode()).description is None
+
+        department = session.exec(select(Department)).one()
+        assert department.description == "Life sciences"  # loaded on access, then serialized
+        assert json.loads(_dump(department))["description"] == "Life sciences"
+
+
+@pytest.mark.skipif(cache.REDIS_URL is not None, reason="APP_REDIS_URL is set")
+def test_helpers_fall_through_without_redis():
+    assert cache.get_client() is None
+
+    calls: List[int] = []
+
+    @cached_one(lambda department_id: f"dept:{department_id}", Department)
+    def read_one(department_id: int) -> Optional[Department]:
+        calls.append(department_id)
+        return Department(id=department_id, name="Biology", code="BIO")
+
+    @cached_list(lambda: "dept:all", Department)
+    def read_all() -> List[Department]:
+        calls.append(0)
+        return []
+
+    assert read_one(1) == read_one(1)
+    assert read_all() == []
+    assert calls == [1, 1, 0]  # every call reaches the wrapped reader
+
+    assert get_many(["dept:1", "dept:2"], Department) == [None, None]
+    set_many({"dept:1": Department(id=1, name="Biology", code="BIO")})
+    invalidate("dept:1")
+    invalidate_pattern("dept:*")
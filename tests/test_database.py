@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.database import get_async_engine, get_async_session, get_session, reset_db
+from app.models import Department, Teacher
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def department_id(new_db) -> int:
+    with get_session(raiseload=False) as session:
+        department = Department(name="Mathematics", code="MATH")
+        session.add(department)
+        session.commit()
+        session.refresh(department)
+        assert department.id is not None
+        session.add(
+            Teacher(
+                employee_id="M1",
+                first_name="Emmy",
+                last_name="Noether",
+                email="emmy@example.com",
+                department_id=department.id,
+            )
+        )
+        session.commit()
+        return department.id
+
+
+def test_raiseload_session_rejects_implicit_lazy_loads(department_id: int):
+    with get_session(raiseload=True) as session:
+        department = session.exec(select(Department).where(Department.id == department_id)).one()
+        with pytest.raises(InvalidRequestError):
+            _ = department.teachers
+
+
+def test_raiseload_session_allows_explicit_eager_loads(department_id: int):
+    with get_session(raiseload=True) as session:
+        query = select(Department).where(Department.id == department_id).options(selectinload(Department.teachers))  # type: ignore[arg-type]
+        department = session.exec(query).one()
+        assert [teacher.employee_id for teacher in department.teachers] == ["M1"]
+
+
+def test_default_session_lazy_loads(department_id: int):
+    with get_session(raiseload=False) as session:
+        department = session.get(Department, department_id)
+        assert department is not None
+        assert len(department.teachers) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_session_reads_by_primary_key(department_id: int):
+    try:
+        async with get_async_session() as session:
+            for _ in range(2):  # the second call runs the prepared statement
+                department = await session.get(Department, department_id)
+                assert department is not None
+                assert department.code == "MATH"
+            result = await session.exec(select(Teacher.employee_id).where(Teacher.department_id == department_id))
+            assert result.all() == ["M1"]
+    finally:
+        await get_async_engine().dispose()
@@ -0,0 +1,47 @@
+import pytest
+
+from app.models import (
+    SLOTS_PER_DAY,
+    SLOTS_PER_WEEK,
+    DayOfWeek,
+    DayOfWeekCode,
+    RoomType,
+    RoomTypeCode,
+    day_code,
+    room_type_code,
+    slot_index,
+)
+from app.occupancy import FULL_DAY_MASK, days_mask, is_free, slot_bit
+
+
+def test_slot_index_packs_day_and_period():
+    assert slot_index(DayOfWeek.MONDAY, 0) == 0
+    assert slot_index(DayOfWeek.TUESDAY, 2) == SLOTS_PER_DAY + 2
+    assert slot_index(DayOfWeek.SUNDAY, SLOTS_PER_DAY - 1) == SLOTS_PER_WEEK - 1
+    assert SLOTS_PER_WEEK <= 63  # must fit a signed BIGINT mask
+
+
+def test_enum_codes_accept_members_and_values():
+    assert day_code(DayOfWeek.FRIDAY) == day_code("FRIDAY") == DayOfWeekCode.FRIDAY
+    assert room_type_code("LAB") == RoomTypeCode.LAB
+    assert [room_type_code(room_type) for room_type in RoomType] == list(RoomTypeCode)
+    with pytest.raises(ValueError):
+        day_code("FUNDAY")
+
+
+def test_days_mask_covers_whole_days():
+    assert days_mask([]) == 0
+    assert days_mask([DayOfWeek.MONDAY]) == FULL_DAY_MASK
+    assert days_mask(["WEDNESDAY"]) == FULL_DAY_MASK << (2 * SLOTS_PER_DAY)
+
+    friday = days_mask([DayOfWeek.FRIDAY])
+    assert not is_free(friday, slot_bit(slot_index(DayOfWeek.FRIDAY, 3)))
+    assert is_free(friday, slot_bit(slot_index(DayOfWeek.THURSDAY, 3)))
+    assert is_free(friday, slot_bit(slot_index(DayOfWeek.SATURDAY, 0)))
+
+
+def test_is_free():
+    busy = slot_bit(3) | slot_bit(10)
+    assert is_free(busy, slot_bit(4))
+    assert not is_free(busy, slot_bit(10))
+    assert is_free(0, slot_bit(0))
@@ -0,0 +1,274 @@
+from datetime import datetime, time
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.database import reset_db, ENGINE
+from app.models import (
+    Course,
+    CourseCreate,
+    Section,
+    Semester,
+    CourseType,
+    DayOfWeek,
+    Department,
+    Room,
+    RoomCreate,
+    RoomType,
+    RoomUpdate,
+    Teacher,
+    TeacherCreate,
+    TimeSlot,
+)
+from app.resource_service import (
+    create_course,
+    create_room,
+    create_teacher,
+    get_sections_for_department,
+    rooms_for_course,
+    rooms_with_equipment,
+    teachers_with_specialization,
+    unavailable_days,
+    update_room,
+)
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def department(new_db) -> Department:
+    with Session(ENGINE) as session:
+        department = Department(name="Computer Science", code="CS")
+        session.add(department)
+        session.commit()
+        session.refresh(department)
+        return department
+
+
+def test_teachers_with_specialization(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        create_teacher(
+            session,
+            TeacherCreate(
+                employee_id="T1",
+                first_name="Ada",
+                last_name="Lovelace",
+                email="ada@example.com",
+                department_id=department.id,
+                specializations=["algorithms", "algorithms", " databases "],
+                unavailable_days=["FRIDAY"],
+            ),
+        )
+        create_teacher(
+            session,
+            TeacherCreate(
+                employee_id="T2",
+                first_name="Alan",
+                last_name="Turing",
+                email="alan@example.com",
+                department_id=department.id,
+                specializations=["theory"],
+            ),
+        )
+
+        teachers = teachers_with_specialization(session, "databases")
+        assert [teacher.employee_id for teacher in teachers] == ["T1"]
+        assert teachers_with_specialization(session, "networks") == []
+
+        teacher_id = teachers[0].id
+        assert teacher_id is not None
+        assert sorted(spec.value for spec in teachers[0].specializations) == ["algorithms", "databases"]
+        assert unavailable_days(session, teacher_id) == ["FRIDAY"]
+
+
+def test_rooms_with_equipment_requires_all_items(department: Department):
+    with Session(ENGINE) as session:
+        lab = create_room(
+            session,
+            RoomCreate(
+                room_number="L1",
+                building="Main",
+                capacity=30,
+                room_type=RoomType.LAB,
+                equipment=["computers", "projector"],
+            ),
+        )
+        create_room(
+            session,
+            RoomCreate(
+                room_number="C1", building="Main", capacity=60, room_type=RoomType.CLASSROOM, equipment=["projector"]
+            ),
+        )
+
+        assert [room.room_number for room in rooms_with_equipment(session, ["projector", "computers"])] == ["L1"]
+        assert len(rooms_with_equipment(session, ["projector"])) == 2
+        assert len(rooms_with_equipment(session, [])) == 2
+
+        assert lab.id is not None
+        update_room(session, lab.id, RoomUpdate(equipment=["whiteboard"]))
+        assert rooms_with_equipment(session, ["computers"]) == []
+
+
+def test_rooms_for_course_matches_type_equipment_and_capacity(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        create_room(
+            session,
+            RoomCreate(room_number="L1", building="Main", capacity=30, room_type=RoomType.LAB, equipment=["computers"]),
+        )
+        create_room(
+            session,
+            RoomCreate(room_number="L2", building="Main", capacity=30, room_type=RoomType.LAB, equipment=["projector"]),
+        )
+        create_room(
+            session,
+            RoomCreate(
+                room_number="C1", building="Main", capacity=60, room_type=RoomType.CLASSROOM, equipment=["computers"]
+            ),
+        )
+        course = create_course(
+            session,
+            CourseCreate(
+                course_code="CS101L",
+                name="Programming Lab",
+                credits=2,
+                course_type=CourseType.LAB,
+                hours_per_week=2,
+                required_room_type=RoomType.LAB,
+                required_equipment=["computers"],
+                semester_number=1,
+                department_id=department.id,
+            ),
+        )
+        assert course.id is not None
+
+        assert [room.room_number for room in rooms_for_course(session, course.id)] == ["L1"]
+        assert rooms_for_course(session, course.id, min_capacity=31) == []
+        assert rooms_for_course(session, 9999) == []
+
+
+def test_update_schema_changes_contain_only_set_fields():
+    update = RoomUpdate(capacity=25, floor=None)
+    assert update.changes() == {"capacity": 25, "floor": None}
+    assert update.changes(exclude={"floor"}) == {"capacity": 25}
+    assert RoomUpdate.model_validate({"building": "East", "unknown": 1}).changes() == {"building": "East"}
+
+
+def test_course_check_constraints_guard_smallint_columns(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        # Table models skip pydantic validation, so the bounds are enforced by the database
+        session.add(
+            Course(
+                course_code="CS000",
+                name="Invalid",
+                credits=0,
+                course_type=CourseType.THEORY,
+                hours_per_week=3,
+                semester_number=1,
+                department_id=department.id,
+            )
+        )
+        with pytest.raises(IntegrityError, match="ck_courses_credits"):
+            session.commit()
+
+
+def test_bounded_columns_are_checked_by_the_database(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        session.add(Room(room_number="R0", building="Main", capacity=0, room_type=RoomType.CLASSROOM))
+        with pytest.raises(IntegrityError, match="ck_rooms_capacity"):
+            session.commit()
+        session.rollback()
+
+        session.add(
+            Teacher(
+                employee_id="T0",
+                first_name="Ada",
+                last_name="Lovelace",
+                email="ada@example.com",
+                department_id=department.id,
+                max_hours_per_week=41,
+            )
+        )
+        with pytest.raises(IntegrityError, match="ck_teachers_max_hours_per_week"):
+            session.commit()
+        session.rollback()
+
+        session.add(
+            Semester(
+                name="Fall 2019",
+                year=2019,
+                semester_number=1,
+                start_date=datetime(2019, 9, 1),
+                end_date=datetime(2019, 12, 20),
+                department_id=department.id,
+            )
+        )
+        with pytest.raises(IntegrityError, match="ck_semesters_year"):
+            session.commit()
+        session.rollback()
+
+        session.add(TimeSlot(name="P9", start_time=time(17), end_time=time(18), day_of_week=DayOfWeek.MONDAY, period=8))
+        with pytest.raises(IntegrityError, match="ck_time_slots_period"):
+            session.commit()
+
+
+def test_sections_follow_their_semester_department(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        other = Department(name="Mathematics", code="MATH")
+        semester = Semester(
+            name="Fall 2024",
+            year=2024,
+            semester_number=1,
+            start_date=datetime(2024, 9, 1),
+            end_date=datetime(2024, 12, 20),
+            department_id=department.id,
+        )
+        session.add_all([other, semester])
+        session.flush()
+        assert semester.id is not None
+        section = Section(name="A", capacity=30, semester_id=semester.id)
+        session.add(section)
+        session.commit()
+        assert section.department_id == department.id
+        assert [s.id for s in get_sections_for_department(session, department.id, semester.id)] == [section.id]
+
+        assert other.id is not None
+        semester.department_id = other.id
+        session.add(semester)
+        session.commit()
+        session.refresh(section)
+        assert section.department_id == other.id
+        assert get_sections_for_department(session, department.id) == []
+
+
+def test_course_description_is_deferred(department: Department):
+    assert department.id is not None
+    with Session(ENGINE) as session:
+        create_course(
+            session,
+            CourseCreate(
+                course_code="CS101",
+                name="Programming",
+                description="A long description",
+                credits=3,
+                course_type=CourseType.THEORY,
+                hours_per_week=3,
+                semester_number=1,
+                department_id=department.id,
+            ),
+        )
+    assert "description" not in str(select(Course))
+    with Session(ENGINE) as session:
+        course = session.exec(select(Course)).one()
+        assert "description" not in course.__dict__
+        assert course.description == "A long description"  # loaded on access
@@ -0,0 +1,149 @@
+import numpy as np
+
+from app.solver import place_lessons, solve
+
+
+def _arrays(n_teachers: int, n_rooms: int, n_sections: int, n_slots: int):
+    return (
+        np.zeros((n_teachers, n_slots), dtype=np.int32),
+        np.zeros((n_rooms, n_slots), dtype=np.int32),
+        np.zeros((n_sections, n_slots), dtype=np.int32),
+    )
+
+
+def test_place_lessons_respects_all_resources():
+    teacher_busy, room_busy, section_busy = _arrays(1, 1, 2, 3)
+    # Same teacher and room for both sections: three lessons fit in three slots, the fourth does not
+    lesson_teacher = np.array([0, 0, 0, 0], dtype=np.int32)
+    lesson_section = np.array([0, 1, 0, 1], dtype=np.int32)
+    lesson_rooms = np.ones((4, 1), dtype=np.int32)
+    slot_order = np.array([0, 1, 2], dtype=np.int32)
+    teacher_load = np.zeros(1, dtype=np.int32)
+    teacher_max = np.array([10], dtype=np.int32)
+    out_slot = np.empty(4, dtype=np.int32)
+    out_room = np.empty(4, dtype=np.int32)
+
+    placed = place_lessons(
+        lesson_teacher,
+        lesson_section,
+        lesson_rooms,
+        np.full(4, -1, dtype=np.int8),
+        np.zeros(1, dtype=np.int8),
+        slot_order,
+        0,
+        teacher_busy,
+        room_busy,
+        section_busy,
+        teacher_load,
+        teacher_max,
+        out_slot,
+        out_room,
+    )
+
+    assert placed == 3
+    assert list(out_slot) == [0, 1, 2, -1]
+    assert list(out_room) == [0, 0, 0, -1]
+    assert teacher_load[0] == 3
+    assert teacher_busy[0].tolist() == [1, 1, 1]
+
+
+def test_place_lessons_skips_busy_slots_rooms_and_overloaded_teachers():
+    teacher_busy, room_busy, section_busy = _arrays(2, 2, 1, 2)
+    teacher_busy[0, 0] = 1  # teacher 0 unavailable in slot 0
+    room_busy[0, 1] = 1  # room 0 already booked in slot 1
+    lesson_teacher = np.array([0, 1], dtype=np.int32)
+    lesson_section = np.array([0, 0], dtype=np.int32)
+    lesson_rooms = np.array([[1, 1], [1, 1]], dtype=np.int32)
+    teacher_load = np.array([0, 2], dtype=np.int32)
+    teacher_max = np.array([5, 2], dtype=np.int32)  # teacher 1 is already at the limit
+    out_slot = np.empty(2, dtype=np.int32)
+    out_room = np.empty(2, dtype=np.int32)
+
+    placed = place_lessons(
+        lesson_teacher,
+        lesson_section,
+        lesson_rooms,
+        np.full(2, -1, dtype=np.int8),
+        np.zeros(2, dtype=np.int8),
+        np.array([0, 1], dtype=np.int32),
+        0,
+        teacher_busy,
+        room_busy,
+        section_busy,
+        teacher_load,
+        teacher_max,
+        out_slot,
+        out_room,
+    )
+
+    assert placed == 1
+    assert (out_slot[0], out_room[0]) == (1, 1)
+    assert (out_slot[1], out_room[1]) == (-1, -1)
+
+
+def test_solve_picks_best_variation_without_mutating_inputs():
+    teacher_busy, room_busy, section_busy = _arrays(2, 1, 1, 2)
+    # Lesson 0 can use either slot, lesson 1 only slot 0 (its teacher is away in slot 1).
+    # Offset 0 puts lesson 0 in slot 0 and strands lesson 1; offset 1 places both.
+    teacher_busy[1, 1] = 1
+    lesson_teacher = np.array([0, 1], dtype=np.int32)
+    lesson_section = np.array([0, 0], dtype=np.int32)
+    lesson_rooms = np.ones((2, 1), dtype=np.int32)
+    slot_order = np.array([0, 1], dtype=np.int32)
+    teacher_load = np.zeros(2, dtype=np.int32)
+    teacher_max = np.array([5, 5], dtype=np.int32)
+
+    out_slot, out_room = solve(
+        lesson_teacher,
+        lesson_section,
+        lesson_rooms,
+        slot_order,
+        teacher_busy,
+        room_busy,
+        section_busy,
+        teacher_load,
+        teacher_max,
+        variations=2,
+    )
+
+    assert list(out_slot) == [1, 0]
+    assert list(out_room) == [0, 0]
+    assert teacher_busy.sum() == 1
+    assert teacher_load.sum() == 0
+
+
+def test_solve_without_slots_places_nothing():
+    teacher_busy, room_busy, section_busy = _arrays(1, 1, 1, 0)
+    out_slot, out_room = solve(
+        np.array([0], dtype=np.int32),
+        np.array([0], dtype=np.int32),
+        np.ones((1, 1), dtype=np.int32),
+        np.array([], dtype=np.int32),
+        teacher_busy,
+        room_busy,
+        section_busy,
+        np.zeros(1, dtype=np.int32),
+        np.array([5], dtype=np.int32),
+    )
+    assert list(out_slot) == [-1]
+    assert list(out_room) == [-1]
+
+
+def test_solve_matches_room_type_codes():
+    teacher_busy, room_busy, section_busy = _arrays(1, 2, 1, 2)
+    # Both rooms are candidates, but only room 1 has the required type code
+    out_slot, out_room = solve(
+        np.array([0], dtype=np.int32),
+        np.array([0], dtype=np.int32),
+        np.ones((1, 2), dtype=np.int8),
+        np.array([0, 1], dtype=np.int32),
+        teacher_busy,
+        room_busy,
+        section_busy,
+        np.zeros(1, dtype=np.int32),
+        np.array([5], dtype=np.int32),
+        lesson_room_type=np.array([3], dtype=np.int8),
+        room_type=np.array([0, 3], dtype=np.int8),
+    )
+    assert list(out_slot) == [0]
+    assert list(out_room) == [1]
@@ -0,0 +1,219 @@
+import pytest
+from datetime import datetime, time
+from typing import Dict
+
+from sqlmodel import Session, select
+
+from app.database import ENGINE, reset_db
+from app.models import (
+    CourseAssignment,
+    CourseCreate,
+    CourseType,
+    DayOfWeek,
+    Department,
+    RoomCreate,
+    RoomType,
+    Section,
+    Semester,
+    Teacher,
+    TeacherCreate,
+    TimeSlot,
+    Timetable,
+    TimetableEntry,
+    TimetableStatus,
+)
+from app.occupancy import load_masks, rebuild_occupancy
+from app.resource_service import create_course, create_room, create_teacher
+from app.timetable_generator import generate_timetable
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def semester_data(new_db) -> Dict[str, int]:
+    """Two sections, a theory course and a lab course, Monday to Wednesday with two periods a day."""
+    with Session(ENGINE) as session:
+        department = Department(name="Chemistry", code="CHEM")
+        session.add(department)
+        session.commit()
+        session.refresh(department)
+        assert department.id is not None
+
+        semester = Semester(
+            name="Spring 2025",
+            year=2025,
+            semester_number=2,
+            start_date=datetime(2025, 1, 10),
+            end_date=datetime(2025, 5, 30),
+            department_id=department.id,
+        )
+        session.add(semester)
+        session.commit()
+        session.refresh(semester)
+        assert semester.id is not None
+
+        session.add_all([Section(name=name, capacity=25, semester_id=semester.id) for name in ("A", "B")])
+        for day in (DayOfWeek.MONDAY, DayOfWeek.TUESDAY, DayOfWeek.WEDNESDAY):
+            for period in (0, 1):
+                session.add(
+                    TimeSlot(
+                        name=f"{day.value} {period}",
+                        start_time=time(9 + period),
+                        end_time=time(10 + period),
+                        day_of_week=day,
+                        period=period,
+                    )
+                )
+        session.commit()
+
+        lecturer = create_teacher(
+            session,
+            TeacherCreate(
+                employee_id="C1",
+                first_name="Marie",
+                last_name="Curie",
+                email="marie@example.com",
+                department_id=department.id,
+                unavailable_days=["TUESDAY"],
+            ),
+        )
+        lab_assistant = create_teacher(
+            session,
+            TeacherCreate(
+                employee_id="C2",
+                first_name="Rosalind",
+                last_name="Franklin",
+                email="rosalind@example.com",
+                department_id=department.id,
+                max_hours_per_week=2,
+            ),
+        )
+        create_room(session, RoomCreate(room_number="101", building="Main", capacity=40, room_type=RoomType.CLASSROOM))
+        lab = create_room(
+            session,
+            RoomCreate(
+                room_number="L1", building="Science", capacity=30, room_type=RoomType.LAB, equipment=["fume hood"]
+            ),
+        )
+        theory = create_course(
+            session,
+            CourseCreate(
+                course_code="CHEM201",
+                name="Organic Chemistry",
+                credits=3,
+                course_type=CourseType.THEORY,
+                hours_per_week=2,
+                semester_number=2,
+                department_id=department.id,
+            ),
+        )
+        practical = create_course(
+            session,
+            CourseCreate(
+                course_code="CHEM201L",
+                name="Organic Chemistry Lab",
+                credits=1,
+                course_type=CourseType.LAB,
+                hours_per_week=2,
+                required_room_type=RoomType.LAB,
+                required_equipment=["fume hood"],
+                semester_number=2,
+                department_id=department.id,
+            ),
+        )
+        assert lecturer.id and lab_assistant.id and theory.id and practical.id and lab.id
+        session.add(CourseAssignment(teacher_id=lecturer.id, course_id=theory.id))
+        session.add(CourseAssignment(teacher_id=lab_assistant.id, course_id=practical.id))
+
+        timetable = Timetable(name="Spring draft", semester_id=semester.id, generation_rules={"variations": 3})
+        session.add(timetable)
+        session.commit()
+        session.refresh(timetable)
+        assert timetable.id is not None
+
+        return {
+            "timetable": timetable.id,
+            "lecturer": lecturer.id,
+            "lab_assistant": lab_assistant.id,
+            "practical": practical.id,
+            "lab": lab.id,
+        }
+
+
+def test_generate_timetable_places_lessons_within_constraints(semester_data: Dict[str, int]):
+    ids = semester_data
+    with Session(ENGINE) as session:
+        result = generate_timetable(session, ids["timetable"])
+
+        # 2 sections x (2 theory + 2 lab hours); the lab assistant may teach only 2 hours a week
+        assert result.lessons_total == 8
+        assert result.entries_created == 6
+        assert result.unplaced_lessons == 2
+
+        entries = list(session.exec(select(TimetableEntry).where(TimetableEntry.timetable_id == ids["timetable"])))
+        assert len(entries) == 6
+        for entry in entries:
+            if entry.teacher_id == ids["lecturer"]:
+                assert entry.time_slot.day_of_week != DayOfWeek.TUESDAY
+            if entry.course_id == ids["practical"]:
+                assert entry.room_id == ids["lab"]
+        assert sum(entry.teacher_id == ids["lab_assistant"] for entry in entries) == 2
+
+        timetable = session.get(Timetable, ids["timetable"])
+        assert timetable is not None
+        assert timetable.generated_at is not None and timetable.generated_at.tzinfo is not None
+
+        masks = load_masks(session, ids["timetable"])
+        rebuild_occupancy(session, ids["timetable"])
+        assert load_masks(session, ids["timetable"]) == masks
+
+
+def test_generate_timetable_skips_inactive_teachers(semester_data: Dict[str, int]):
+    ids = semester_data
+    with Session(ENGINE) as session:
+        # The lecturer also covers the practical course as a secondary assignment
+        session.add(CourseAssignment(teacher_id=ids["lecturer"], course_id=ids["practical"], is_primary=False))
+        lab_assistant = session.get(Teacher, ids["lab_assistant"])
+        assert lab_assistant is not None
+        lab_assistant.is_active = False
+        session.add(lab_assistant)
+        session.commit()
+
+        result = generate_timetable(session, ids["timetable"])
+
+        entries = list(session.exec(select(TimetableEntry).where(TimetableEntry.timetable_id == ids["timetable"])))
+        assert result.entries_created == len(entries) > 0
+        assert {entry.teacher_id for entry in entries} == {ids["lecturer"]}
+        assert any(entry.course_id == ids["practical"] for entry in entries)
+
+
+def test_generate_timetable_keeps_existing_entries(semester_data: Dict[str, int]):
+    ids = semester_data
+    with Session(ENGINE) as session:
+        first = generate_timetable(session, ids["timetable"])
+        second = generate_timetable(session, ids["timetable"])
+
+        assert first.entries_created == 6
+        assert second.lessons_total == 2
+        assert second.entries_created == 0
+        entries = session.exec(select(TimetableEntry).where(TimetableEntry.timetable_id == ids["timetable"])).all()
+        assert len(entries) == 6
+
+
+def test_generate_timetable_requires_draft(semester_data: Dict[str, int]):
+    with Session(ENGINE) as session:
+        timetable = session.get(Timetable, semester_data["timetable"])
+        assert timetable is not None
+        timetable.status = TimetableStatus.PUBLISHED
+        session.add(timetable)
+        session.commit()
+
+        with pytest.raises(ValueError, match="draft"):
+            generate_timetable(session, semester_data["timetable"])
+        with pytest.raises(ValueError, match="not found"):
+            generate_timetable(session, 9999)
@@ -0,0 +1,364 @@
+import pytest
+from datetime import datetime, time
+from typing import Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, update
+
+from app.database import ENGINE, reset_db
+from app.models import (
+    Course,
+    CourseType,
+    DayOfWeek,
+    Department,
+    Room,
+    RoomType,
+    Section,
+    Semester,
+    Teacher,
+    TimeSlot,
+    ResourceKind,
+    Timetable,
+    TimetableEntry,
+    TimetableEntryCreate,
+    TimetableStatus,
+    TimeSlotCreate,
+    TimeSlotUpdate,
+    slot_index,
+)
+from app.occupancy import load_masks, rebuild_occupancy, slot_bit
+from app.resource_service import create_time_slot, update_time_slot
+from app.timetable_service import (
+    create_timetable_entry,
+    delete_timetable_entry,
+    get_teacher_loads,
+    get_timetable_view,
+    recluster_timetable_entries,
+    set_timetable_status,
+)
+
+
+@pytest.fixture()
+def new_db():
+    reset_db()
+    yield
+    reset_db()
+
+
+@pytest.fixture()
+def sample_data(new_db) -> Dict[str, int]:
+    """Create one department with two of each schedulable resource and return their ids."""
+    with Session(ENGINE) as session:
+        department = Department(name="Physics", code="PHY")
+        session.add(department)
+        session.flush()
+        assert department.id is not None
+
+        semester = Semester(
+            name="Fall 2024",
+            year=2024,
+            semester_number=1,
+            start_date=datetime(2024, 9, 1),
+            end_date=datetime(2024, 12, 20),
+            department_id=department.id,
+        )
+        session.add(semester)
+        session.flush()
+        assert semester.id is not None
+
+        sections = [Section(name=name, capacity=30, semester_id=semester.id) for name in ("A", "B")]
+        teachers = [
+            Teacher(
+                employee_id=f"P{i}",
+                first_name="Teacher",
+                last_name=str(i),
+                email=f"p{i}@example.com",
+                department_id=department.id,
+            )
+            for i in (1, 2)
+        ]
+        rooms = [Room(room_number=f"R{i}", building="Main", capacity=40, room_type=RoomType.CLASSROOM) for i in (1, 2)]
+        course = Course(
+            course_code="PHY101",
+            name="Mechanics",
+            credits=3,
+            course_type=CourseType.THEORY,
+            hours_per_week=3,
+            semester_number=1,
+            department_id=department.id,
+        )
+        slots = [
+            TimeSlot(
+                name=f"Period {i}",
+                start_time=time(8 + i),
+                end_time=time(9 + i),
+                day_of_week=DayOfWeek.MONDAY,
+                period=i,
+            )
+            for i in (1, 2)
+        ]
+        timetable = Timetable(name="Fall draft", semester_id=semester.id)
+        session.add_all([*sections, *teachers, *rooms, course, *slots, timetable])
+        session.commit()
+
+        ids = {
+            "department": department.id,
+            "semester": semester.id,
+            "course": course.id,
+            "timetable": timetable.id,
+            "section_a": sections[0].id,
+            "section_b": sections[1].id,
+            "teacher_1": teachers[0].id,
+            "teacher_2": teachers[1].id,
+            "room_1": rooms[0].id,
+            "room_2": rooms[1].id,
+            "slot_1": slots[0].id,
+            "slot_2": slots[1].id,
+        }
+        return {key: value for key, value in ids.items() if value is not None}
+
+
+def _entry(ids: Dict[str, int], teacher: str, room: str, section: str, slot: str) -> TimetableEntryCreate:
+    return TimetableEntryCreate(
+        timetable_id=ids["timetable"],
+        course_id=ids["course"],
+        teacher_id=ids[teacher],
+        room_id=ids[room],
+        section_id=ids[section],
+        time_slot_id=ids[slot],
+    )
+
+
+def test_create_timetable_entry_rejects_double_booking(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        with pytest.raises(ValueError, match="already booked"):
+            create_timetable_entry(session, _entry(ids, "teacher_1", "room_2", "section_b", "slot_1"))
+
+
+def test_unique_constraints_enforce_one_booking_per_slot(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        session.add(TimetableEntry(**_entry(ids, "teacher_1", "room_1", "section_a", "slot_1").model_dump()))
+        session.commit()
+        session.add(TimetableEntry(**_entry(ids, "teacher_2", "room_1", "section_b", "slot_1").model_dump()))
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+
+def test_create_timetable_entry_rejects_unavailable_teacher(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        teacher = session.get(Teacher, ids["teacher_1"])
+        assert teacher is not None
+        teacher.unavailable_mask = slot_bit(slot_index(DayOfWeek.MONDAY, 1))
+        session.add(teacher)
+        session.commit()
+
+        with pytest.raises(ValueError, match="unavailable"):
+            create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        assert create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_2")).id
+
+
+def test_occupancy_masks_follow_entries(sample_data: Dict[str, int]):
+    ids = sample_data
+    slot_1 = slot_bit(slot_index(DayOfWeek.MONDAY, 1))
+    slot_2 = slot_bit(slot_index(DayOfWeek.MONDAY, 2))
+    with Session(ENGINE) as session:
+        first = create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_2", "section_b", "slot_2"))
+
+        masks = load_masks(session, ids["timetable"])
+        assert masks[(ResourceKind.TEACHER, ids["teacher_1"])] == slot_1 | slot_2
+        assert masks[(ResourceKind.ROOM, ids["room_1"])] == slot_1
+        assert masks[(ResourceKind.SECTION, ids["section_b"])] == slot_2
+
+        rebuild_occupancy(session, ids["timetable"])
+        session.commit()
+        assert load_masks(session, ids["timetable"]) == masks
+
+        assert first.id is not None
+        assert delete_timetable_entry(session, first.id)
+        masks = load_masks(session, ids["timetable"])
+        assert masks[(ResourceKind.TEACHER, ids["teacher_1"])] == slot_2
+        assert masks[(ResourceKind.ROOM, ids["room_1"])] == 0
+        assert not delete_timetable_entry(session, first.id)
+
+
+def test_archiving_moves_entries_out_of_the_active_set(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        entry = create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        assert not entry.is_archived
+
+        timetable = set_timetable_status(session, ids["timetable"], TimetableStatus.ARCHIVED)
+        assert timetable is not None
+        assert timetable.status == TimetableStatus.ARCHIVED
+        session.refresh(entry)
+        assert entry.is_archived
+        with pytest.raises(ValueError, match="archived"):
+            create_timetable_entry(session, _entry(ids, "teacher_2", "room_2", "section_b", "slot_2"))
+
+        set_timetable_status(session, ids["timetable"], TimetableStatus.DRAFT)
+        session.refresh(entry)
+        assert not entry.is_archived
+        assert set_timetable_status(session, 9999, TimetableStatus.ARCHIVED) is None
+
+        # Status changes made outside the service are carried over by the timetables trigger
+        timetable.status = TimetableStatus.ARCHIVED
+        session.add(timetable)
+        session.commit()
+        session.refresh(entry)
+        assert entry.is_archived
+
+
+def test_teacher_loads_follow_entries(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        first = create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_2", "section_b", "slot_2"))
+        assert get_teacher_loads(session, ids["timetable"]) == {ids["teacher_1"]: 2}
+
+        session.exec(update(TimetableEntry).where(TimetableEntry.id == first.id).values(teacher_id=ids["teacher_2"]))  # type: ignore[call-overload]
+        session.commit()
+        assert get_teacher_loads(session, ids["timetable"]) == {ids["teacher_1"]: 1, ids["teacher_2"]: 1}
+
+        assert first.id is not None
+        delete_timetable_entry(session, first.id)
+        assert get_teacher_loads(session, ids["timetable"], [ids["teacher_2"]]) == {ids["teacher_2"]: 0}
+
+
+def test_create_timetable_entry_respects_max_hours(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        teacher = session.get(Teacher, ids["teacher_1"])
+        assert teacher is not None
+        teacher.max_hours_per_week = 1
+        session.add(teacher)
+        session.commit()
+
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        with pytest.raises(ValueError, match="already teaches 1 hours"):
+            create_timetable_entry(session, _entry(ids, "teacher_1", "room_2", "section_b", "slot_2"))
+
+
+def test_timetable_view_is_one_query(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        assert get_timetable_view(session, ids["timetable"]).entries == []  # type: ignore[union-attr]
+        create_timetable_entry(session, _entry(ids, "teacher_2", "room_2", "section_b", "slot_2"))
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(ENGINE, "before_cursor_execute", record)
+    try:
+        with Session(ENGINE) as session:
+            view = get_timetable_view(session, ids["timetable"])
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", record)
+    assert len(statements) == 1
+
+    assert view is not None
+    assert view.name == "Fall draft"
+    assert view.status == TimetableStatus.DRAFT
+    assert [(e.period, e.section_name, e.teacher_name, e.room_number) for e in view.entries] == [
+        (1, "A", "Teacher 1", "R1"),
+        (2, "B", "Teacher 2", "R2"),
+    ]
+    assert view.entries[0].day_of_week == DayOfWeek.MONDAY
+    assert view.entries[0].start_time == time(9)
+    with Session(ENGINE) as session:
+        assert get_timetable_view(session, 9999) is None
+
+
+def test_status_checks_do_not_load_the_entry_graph(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(ENGINE, "before_cursor_execute", record)
+    try:
+        with Session(ENGINE) as session:
+            create_timetable_entry(session, _entry(ids, "teacher_2", "room_2", "section_b", "slot_2"))
+            assert statements[0].startswith("SELECT timetables.status \n")
+            statements.clear()
+
+            timetable = set_timetable_status(session, ids["timetable"], TimetableStatus.PUBLISHED)
+            assert timetable is not None
+            assert timetable.status == TimetableStatus.PUBLISHED
+    finally:
+        event.remove(ENGINE, "before_cursor_execute", record)
+    assert not any("timetable_entries" in statement for statement in statements)
+
+
+def test_timetable_entries_are_clustered_by_timetable_and_slot(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_2"))
+        create_timetable_entry(session, _entry(ids, "teacher_2", "room_2", "section_b", "slot_1"))
+        recluster_timetable_entries(session)
+
+        clustered_on = session.execute(
+            text(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = 'timetable_entries'::regclass AND i.indisclustered"
+            )
+        ).scalars()
+        assert list(clustered_on) == ["ix_tte_timetable_slot"]
+        active = session.execute(text("SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_tte_active'")).scalar_one()
+        assert active.endswith("WHERE (NOT is_archived)")
+        slots = session.execute(text("SELECT time_slot_id FROM timetable_entries")).scalars()
+        assert list(slots) == [ids["slot_1"], ids["slot_2"]]
+
+
+def test_moving_a_time_slot_moves_its_occupancy_bits(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        create_timetable_entry(session, _entry(ids, "teacher_1", "room_1", "section_a", "slot_1"))
+        update_time_slot(session, ids["slot_1"], TimeSlotUpdate(day_of_week=DayOfWeek.TUESDAY))
+
+        tuesday = slot_bit(slot_index(DayOfWeek.TUESDAY, 1))
+        assert load_masks(session, ids["timetable"])[(ResourceKind.TEACHER, ids["teacher_1"])] == tuesday
+
+        # The teacher is busy on Tuesday now, and free again in the Monday period the slot left
+        monday = create_time_slot(
+            session,
+            TimeSlotCreate(
+                name="Monday 1", start_time=time(9), end_time=time(10), day_of_week=DayOfWeek.MONDAY, period=1
+            ),
+        )
+        assert monday.id is not None
+        entry = _entry(ids, "teacher_1", "room_2", "section_b", "slot_1")
+        entry.time_slot_id = monday.id
+        assert create_timetable_entry(session, entry).id
+
+
+def test_active_time_slots_cannot_share_day_and_period(sample_data: Dict[str, int]):
+    ids = sample_data
+    with Session(ENGINE) as session:
+        with pytest.raises(ValueError, match="already covers MONDAY period 1"):
+            update_time_slot(session, ids["slot_2"], TimeSlotUpdate(period=1))
+    with Session(ENGINE) as session:
+        with pytest.raises(ValueError, match="already covers MONDAY period 2"):
+            create_time_slot(
+                session,
+                TimeSlotCreate(
+                    name="Duplicate", start_time=time(10), end_time=time(11), day_of_week=DayOfWeek.MONDAY, period=2
+                ),
+            )
+        session.add(
+            TimeSlot(name="Duplicate", start_time=time(10), end_time=time(11), day_of_week=DayOfWeek.MONDAY, period=2)
+        )
+        with pytest.raises(IntegrityError, match="uq_time_slots_active_slot_index"):
+            session.commit()